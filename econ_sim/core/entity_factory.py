@@ -7,7 +7,7 @@
 
 from __future__ import annotations
 
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 import numpy as np
 
@@ -21,6 +21,7 @@ from ..data_access.models import (
     HouseholdState,
     MacroState,
     SimulationFeatures,
+    WorldState,
 )
 from ..utils.settings import WorldConfig
 
@@ -41,9 +42,21 @@ def _rng_for(
     return np.random.default_rng(seed)
 
 
-def create_household_state(config: WorldConfig, household_id: int) -> HouseholdState:
+def _education_participation(config: WorldConfig) -> float:
+    try:
+        return float(config.policies.education_initial_participation)
+    except Exception:
+        return 0.0
+
+
+def _build_household_state(
+    config: WorldConfig,
+    household_id: int,
+    *,
+    base_wage: float,
+    participation: float,
+) -> HouseholdState:
     rng = _rng_for(config, AgentKind.HOUSEHOLD, household_id)
-    markets = config.markets
 
     skill = float(max(0.4, rng.normal(1.0, 0.15)))
     preference = float(np.clip(rng.normal(0.5, 0.1), 0.2, 0.8))
@@ -58,17 +71,10 @@ def create_household_state(config: WorldConfig, household_id: int) -> HouseholdS
         inventory_goods=inventory_goods,
     )
 
-    reservation_wage = float(
-        np.clip(markets.labor.base_wage * skill * 0.8, 40.0, 120.0)
-    )
+    reservation_wage = float(np.clip(base_wage * skill * 0.8, 40.0, 120.0))
 
     # initial studying participation: use config-driven probability with
     # deterministic RNG per household so test/seeding is reproducible
-    try:
-        participation = float(config.policies.education_initial_participation)
-    except Exception:
-        participation = 0.0
-
     is_studying = bool(rng.uniform(0.0, 1.0) < max(0.0, min(1.0, participation)))
 
     return HouseholdState(
@@ -81,6 +87,35 @@ def create_household_state(config: WorldConfig, household_id: int) -> HouseholdS
     )
 
 
+def create_household_state(config: WorldConfig, household_id: int) -> HouseholdState:
+    return _build_household_state(
+        config,
+        household_id,
+        base_wage=config.markets.labor.base_wage,
+        participation=_education_participation(config),
+    )
+
+
+def create_household_states(
+    config: WorldConfig, household_ids: Iterable[int]
+) -> Dict[int, HouseholdState]:
+    """批量构造家户初始状态，结果与逐个调用 create_household_state 完全一致。
+
+    配置项只读取一次；每个家户仍使用各自的确定性 RNG，保证可复现。
+    """
+    base_wage = config.markets.labor.base_wage
+    participation = _education_participation(config)
+    return {
+        household_id: _build_household_state(
+            config,
+            household_id,
+            base_wage=base_wage,
+            participation=participation,
+        )
+        for household_id in household_ids
+    }
+
+
 def create_firm_state(config: WorldConfig, entity_id: str) -> FirmState:
     rng = _rng_for(config, AgentKind.FIRM, entity_id)
     sim_cfg = config.simulation
@@ -187,12 +222,40 @@ def create_simulation_features(config: WorldConfig) -> SimulationFeatures:
     return SimulationFeatures()
 
 
+def create_sample_world(
+    config: WorldConfig,
+    num_households: int,
+    *,
+    simulation_id: str = "debug",
+    tick: int = 1,
+    day: int = 1,
+) -> WorldState:
+    """构造一个只存在于内存中的完整样例世界，供调试工具与离线推演脚本复用。
+
+    家户编号为 ``0..num_households-1``，其余实体使用默认 id。
+    """
+    households = create_household_states(config, range(num_households))
+    return WorldState(
+        simulation_id=simulation_id,
+        tick=tick,
+        day=day,
+        households=households,
+        firm=create_firm_state(config, "firm_1"),
+        bank=create_bank_state(config, "bank", households),
+        government=create_government_state(config, "government"),
+        central_bank=create_central_bank_state(config, "central_bank"),
+        macro=create_macro_state(),
+    )
+
+
 __all__ = [
     "create_household_state",
+    "create_household_states",
     "create_firm_state",
     "create_government_state",
     "create_central_bank_state",
     "create_bank_state",
     "create_macro_state",
     "create_simulation_features",
+    "create_sample_world",
 ]
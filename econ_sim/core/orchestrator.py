@@ -32,7 +32,7 @@ from ..data_access.models import (
 from ..data_access.redis_client import DataAccessLayer, SimulationNotFoundError
 from ..core.fallback_manager import BaselineFallbackManager, FallbackExecutionError
 from ..logic_modules.agent_logic import collect_tick_decisions, merge_tick_overrides
-from ..utils.settings import get_world_config
+from ..utils.settings import SimulationParameters, get_world_config
 from ..script_engine import script_registry
 from ..script_engine.notifications import (
     LoggingScriptFailureNotifier,
@@ -86,6 +86,21 @@ class DayBoundaryRequiredError(RuntimeError):
         self.ticks_per_day = ticks_per_day
 
 
+def next_tick_and_day(
+    sim_config: SimulationParameters, tick: int, day: int
+) -> tuple[int, int]:
+    """Return the (tick, day) a world currently at ``tick``/``day`` advances to."""
+    next_tick = tick + 1
+    ticks_since_start = next_tick - sim_config.initial_tick
+    if ticks_since_start <= 0:
+        next_day = sim_config.initial_day
+    else:
+        next_day = sim_config.initial_day + math.ceil(
+            ticks_since_start / sim_config.ticks_per_day
+        )
+    return next_tick, max(next_day, day)
+
+
 class SimulationOrchestrator:
     """Main simulation orchestrator wired to new modular logic modules."""
 
@@ -508,16 +523,9 @@ class SimulationOrchestrator:
                 )
             )
 
-        next_tick = world_state.tick + 1
-        sim_config = self.config.simulation
-        ticks_since_start = next_tick - sim_config.initial_tick
-        if ticks_since_start <= 0:
-            next_day = sim_config.initial_day
-        else:
-            next_day = sim_config.initial_day + math.ceil(
-                ticks_since_start / sim_config.ticks_per_day
-            )
-        next_day = max(next_day, world_state.day)
+        next_tick, next_day = next_tick_and_day(
+            self.config.simulation, world_state.tick, world_state.day
+        )
 
         updates.append(
             StateUpdateCommand.assign(
@@ -833,6 +833,22 @@ class DataAccessLayer:
     )
     _sampler_interval: float = field(default=5.0)
 
+    @classmethod
+    def with_in_memory_store(
+        cls, config: Optional[WorldConfig] = None
+    ) -> "DataAccessLayer":
+        """构建纯内存的数据访问层，忽略 Redis/Postgres 相关环境变量。
+
+        适用于测试等需要与外部存储完全隔离的场景。
+        """
+
+        fallback = InMemoryStateStore()
+        return cls(
+            config=config or get_world_config(),
+            store=fallback,
+            fallback_store=fallback,
+        )
+
     @classmethod
     def with_default_store(
         cls, config: Optional[WorldConfig] = None
@@ -3,7 +3,7 @@ and clear employment relationships.
 
 This module is intended to be invoked by the orchestrator at the start of a
 tick when `is_daily_decision_tick` is True. It will:
-- Pay wages to firm.employees and government.employees using finance_market.transfer
+- Pay wages to firm.employees and government.employees using finance_market.transfer_batch
 - Clear employment_status and employer_id on households
 - Clear firm's and government's employee lists and labor_assignment
 
@@ -25,6 +25,97 @@ from ..data_access.models import (
 from ..utils.settings import get_world_config
 
 
+def _pay_wages(
+    world_state: WorldState,
+    payer_kind: AgentKind,
+    payer_id: str,
+    employees: List[int],
+    wage: float,
+    updates: List[StateUpdateCommand],
+    *,
+    tick: int,
+    day: int,
+) -> Tuple[int, float]:
+    """Pay ``wage`` to every known employee with one batched transfer.
+
+    Employees missing from ``world_state.households`` are skipped. If the batch
+    fails it is not applied, and each employee is paid with an individual
+    transfer instead (best-effort). Returns ``(paid_count, total_paid)``.
+    """
+    from . import finance_market
+
+    payees = []
+    for hid in employees:
+        try:
+            if int(hid) in world_state.households:
+                payees.append(str(hid))
+        except (TypeError, ValueError):
+            continue
+    if not payees:
+        return 0, 0.0
+    try:
+        t_updates, _t_ledgers, _t_log = finance_market.transfer_batch(
+            world_state,
+            payer_kind=payer_kind,
+            payer_id=payer_id,
+            payee_kind=AgentKind.HOUSEHOLD,
+            payee_ids=payees,
+            amount=wage,
+            tick=tick,
+            day=day,
+        )
+    except Exception:
+        # transfer_batch leaves world_state untouched on failure; fall back to
+        # per-employee transfers so one bad payee does not block the others.
+        return _pay_wages_individually(
+            world_state,
+            payer_kind,
+            payer_id,
+            payees,
+            wage,
+            updates,
+            tick=tick,
+            day=day,
+        )
+    updates.extend(t_updates)
+    return len(payees), wage * len(payees)
+
+
+def _pay_wages_individually(
+    world_state: WorldState,
+    payer_kind: AgentKind,
+    payer_id: str,
+    payees: List[str],
+    wage: float,
+    updates: List[StateUpdateCommand],
+    *,
+    tick: int,
+    day: int,
+) -> Tuple[int, float]:
+    from . import finance_market
+
+    paid_count = 0
+    for hid in payees:
+        try:
+            t_updates, _t_ledgers, _t_log = finance_market.transfer(
+                world_state,
+                payer_kind=payer_kind,
+                payer_id=payer_id,
+                payee_kind=AgentKind.HOUSEHOLD,
+                payee_id=hid,
+                amount=wage,
+                tick=tick,
+                day=day,
+            )
+        except Exception:
+            # ignore individual transfer failures (best-effort)
+            continue
+        if t_updates:
+            updates.extend(t_updates)
+        paid_count += 1
+    return paid_count, wage * paid_count
+
+
 def settle_previous_day(
     world_state: WorldState, *, tick: int, day: int
 ) -> Tuple[List[StateUpdateCommand], TickLogEntry]:
@@ -39,8 +130,6 @@ def settle_previous_day(
     firm = getattr(world_state, "firm", None)
     government = getattr(world_state, "government", None)
 
-    from . import finance_market
-
     total_paid = 0.0
     paid_count = 0
 
@@ -49,27 +138,18 @@ def settle_previous_day(
         wage = float(getattr(firm, "wage_offer", 0.0))
         # copy list to avoid mutation during iteration
         assigned = list(getattr(firm, "employees", []) or [])
-        for hid in assigned:
-            try:
-                # use finance_market.transfer to perform atomic ledger+updates
-                t_updates, t_ledgers, t_log = finance_market.transfer(
-                    world_state,
-                    payer_kind=AgentKind.FIRM,
-                    payer_id=firm.id,
-                    payee_kind=AgentKind.HOUSEHOLD,
-                    payee_id=str(hid),
-                    amount=wage,
-                    tick=tick,
-                    day=day,
-                )
-                # collect returned updates/ledgers into persisted updates
-                if t_updates:
-                    updates.extend(t_updates)
-                total_paid += wage
-                paid_count += 1
-            except Exception:
-                # ignore individual transfer failures (best-effort)
-                continue
+        paid_count_firm, paid_firm = _pay_wages(
+            world_state,
+            AgentKind.FIRM,
+            firm.id,
+            assigned,
+            wage,
+            updates,
+            tick=tick,
+            day=day,
+        )
+        paid_count += paid_count_firm
+        total_paid += paid_firm
 
         # clear employment links in-memory
         for hid in assigned:
@@ -106,24 +186,18 @@ def settle_previous_day(
     if government is not None and getattr(government, "employees", None):
         gov_wage = float(getattr(government, "unemployment_benefit", 50.0))
         assigned_gov = list(getattr(government, "employees", []) or [])
-        for hid in assigned_gov:
-            try:
-                t_updates, t_ledgers, t_log = finance_market.transfer(
-                    world_state,
-                    payer_kind=AgentKind.GOVERNMENT,
-                    payer_id=government.id,
-                    payee_kind=AgentKind.HOUSEHOLD,
-                    payee_id=str(hid),
-                    amount=gov_wage,
-                    tick=tick,
-                    day=day,
-                )
-                if t_updates:
-                    updates.extend(t_updates)
-                total_paid += gov_wage
-                paid_count += 1
-            except Exception:
-                continue
+        paid_count_gov, paid_gov = _pay_wages(
+            world_state,
+            AgentKind.GOVERNMENT,
+            government.id,
+            assigned_gov,
+            gov_wage,
+            updates,
+            tick=tick,
+            day=day,
+        )
+        paid_count += paid_count_gov
+        total_paid += paid_gov
 
         for hid in assigned_gov:
             hh = world_state.households.get(int(hid))
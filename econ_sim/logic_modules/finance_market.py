@@ -6,7 +6,7 @@
 
 from __future__ import annotations
 
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Sequence
 
 from ..data_access.models import (
     WorldState,
@@ -43,6 +43,24 @@ def _assign_balance_sheet_updates(
     return StateUpdateCommand.assign(scope=kind, agent_id=entity_id, balance_sheet=bs)
 
 
+def _resolve_cash_holder(
+    world_state: WorldState, kind: AgentKind, entity_id: str, *, role: str
+) -> Any:
+    """Return the in-memory entity whose balance_sheet.cash a transfer touches."""
+    if kind is AgentKind.HOUSEHOLD:
+        return world_state.households[int(entity_id)]
+    elif kind is AgentKind.FIRM:
+        return world_state.firm
+    elif kind is AgentKind.GOVERNMENT:
+        return world_state.government
+    elif kind is AgentKind.BANK:
+        return world_state.bank
+    elif kind is AgentKind.CENTRAL_BANK:
+        return world_state.central_bank
+    else:
+        raise ValueError(f"Unsupported {role} kind: {kind}")
+
+
 def transfer(
     world_state: WorldState,
     payer_kind: AgentKind,
@@ -69,41 +87,10 @@ def transfer(
         )
 
     # mutate the actual world_state objects (so callers observing ws see changes)
-    if payer_kind is AgentKind.HOUSEHOLD:
-        payer = world_state.households[int(payer_id)]
-        payer_cash = float(payer.balance_sheet.cash or 0.0)
-    elif payer_kind is AgentKind.FIRM:
-        payer = world_state.firm
-        payer_cash = float(payer.balance_sheet.cash or 0.0)
-    elif payer_kind is AgentKind.GOVERNMENT:
-        payer = world_state.government
-        payer_cash = float(payer.balance_sheet.cash or 0.0)
-    elif payer_kind is AgentKind.BANK:
-        payer = world_state.bank
-        payer_cash = float(payer.balance_sheet.cash or 0.0)
-    elif payer_kind is AgentKind.CENTRAL_BANK:
-        payer = world_state.central_bank
-        payer_cash = float(payer.balance_sheet.cash or 0.0)
-    else:
-        raise ValueError(f"Unsupported payer kind: {payer_kind}")
-
-    if payee_kind is AgentKind.HOUSEHOLD:
-        payee = world_state.households[int(payee_id)]
-        payee_cash = float(payee.balance_sheet.cash or 0.0)
-    elif payee_kind is AgentKind.FIRM:
-        payee = world_state.firm
-        payee_cash = float(payee.balance_sheet.cash or 0.0)
-    elif payee_kind is AgentKind.GOVERNMENT:
-        payee = world_state.government
-        payee_cash = float(payee.balance_sheet.cash or 0.0)
-    elif payee_kind is AgentKind.BANK:
-        payee = world_state.bank
-        payee_cash = float(payee.balance_sheet.cash or 0.0)
-    elif payee_kind is AgentKind.CENTRAL_BANK:
-        payee = world_state.central_bank
-        payee_cash = float(payee.balance_sheet.cash or 0.0)
-    else:
-        raise ValueError(f"Unsupported payee kind: {payee_kind}")
+    payer = _resolve_cash_holder(world_state, payer_kind, payer_id, role="payer")
+    payer_cash = float(payer.balance_sheet.cash or 0.0)
+    payee = _resolve_cash_holder(world_state, payee_kind, payee_id, role="payee")
+    payee_cash = float(payee.balance_sheet.cash or 0.0)
 
     transfer_amount = float(amount)
     # central bank may create reserves / money; allow unlimited transfer from central bank
@@ -170,6 +157,115 @@ def transfer(
     return updates, ledgers, log
 
 
+def transfer_batch(
+    world_state: WorldState,
+    payer_kind: AgentKind,
+    payer_id: str,
+    payee_kind: AgentKind,
+    payee_ids: Sequence[str],
+    amount: float,
+    tick: int,
+    day: int,
+) -> Tuple[List[StateUpdateCommand], List[LedgerEntry], TickLogEntry]:
+    """Pay the same ``amount`` from one payer to each of ``payee_ids``.
+
+    Equivalent to calling :func:`transfer` once per payee in order (each payee
+    receives ``min(amount, remaining payer cash)``), but the payer's
+    balance_sheet is written back and persisted only once, with a single
+    aggregated ``transfer_out`` ledger row. All payees are resolved and all
+    balances computed before world_state is mutated, so the batch either
+    applies completely or not at all.
+    """
+    payees = [
+        (str(pid), _resolve_cash_holder(world_state, payee_kind, pid, role="payee"))
+        for pid in payee_ids
+    ]
+    if amount <= 0 or not payees:
+        return (
+            [],
+            [],
+            TickLogEntry(
+                tick=tick,
+                day=day,
+                message="transfer_skipped",
+                context={"amount": 0.0, "payee_count": len(payees)},
+            ),
+        )
+
+    payer = _resolve_cash_holder(world_state, payer_kind, payer_id, role="payer")
+    payer_cash = float(payer.balance_sheet.cash or 0.0)
+    unlimited = payer_kind is AgentKind.CENTRAL_BANK
+    transfer_amount = float(amount)
+
+    # Compute every balance and ledger row before touching world_state, so a
+    # failure part-way leaves no payee credited without its update/ledger.
+    ledgers: List[LedgerEntry] = []
+    paid_by_payee: Dict[str, Any] = {}
+    cash_after: Dict[str, float] = {}
+    total = 0.0
+    for pid, payee in payees:
+        actual = transfer_amount if unlimited else min(transfer_amount, payer_cash)
+        payer_cash -= actual
+        total += actual
+        payee_cash_after = (
+            cash_after.get(pid, float(payee.balance_sheet.cash or 0.0)) + actual
+        )
+        cash_after[pid] = payee_cash_after
+        paid_by_payee[pid] = payee
+        ledgers.append(
+            LedgerEntry(
+                tick=tick,
+                day=day,
+                account_kind=payee_kind,
+                entity_id=pid,
+                entry_type="transfer_in",
+                amount=actual,
+                balance_after=payee_cash_after,
+            )
+        )
+    ledgers.insert(
+        0,
+        LedgerEntry(
+            tick=tick,
+            day=day,
+            account_kind=payer_kind,
+            entity_id=str(payer_id),
+            entry_type="transfer_out",
+            amount=-total,
+            balance_after=payer_cash,
+        ),
+    )
+
+    # write back into world_state
+    payer.balance_sheet.cash = payer_cash
+    for pid, payee in paid_by_payee.items():
+        payee.balance_sheet.cash = cash_after[pid]
+
+    updates: List[StateUpdateCommand] = [
+        _assign_balance_sheet_updates(
+            payer_kind, payer_id, payer.balance_sheet.model_dump()
+        )
+    ]
+    updates.extend(
+        _assign_balance_sheet_updates(payee_kind, pid, payee.balance_sheet.model_dump())
+        for pid, payee in paid_by_payee.items()
+    )
+
+    log = TickLogEntry(
+        tick=tick,
+        day=day,
+        message="cash_transfer_batch",
+        context={
+            "payer": str(payer_id),
+            "payee_count": len(payees),
+            "amount": transfer_amount,
+            "total": float(total),
+        },
+    )
+
+    return updates, ledgers, log
+
+
 def deposit(
     world_state: WorldState,
     household_id: int,
@@ -10,7 +10,7 @@ import asyncio
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 from ..data_access.models import AgentKind
 from ..data_access.postgres_support import get_pool
@@ -24,6 +24,22 @@ class StoredScript:
     code: str
 
 
+def _row_to_stored_script(row) -> StoredScript:
+    metadata = ScriptMetadata(
+        script_id=str(row["script_id"]),
+        simulation_id=row["simulation_id"],
+        user_id=row["user_id"],
+        description=row["description"],
+        created_at=row["created_at"],
+        code_version=str(row["code_version"]),
+        agent_kind=AgentKind(row["agent_kind"]),
+        entity_id=row["entity_id"],
+        last_failure_at=row["last_failure_at"],
+        last_failure_reason=row["last_failure_reason"],
+    )
+    return StoredScript(metadata=metadata, code=row["code"])
+
+
 class PostgresScriptStore:
     def __init__(
         self,
@@ -167,41 +183,23 @@ class PostgresScriptStore:
                 )
 
     async def fetch_simulation_scripts(self, simulation_id: str) -> List[StoredScript]:
-        await self._ensure_schema()
-        pool = await get_pool(
-            self._dsn, min_size=self._min_pool, max_size=self._max_pool
+        return await self.fetch_scripts_for_simulations([simulation_id])
+
+    async def fetch_scripts_for_simulations(
+        self, simulation_ids: Sequence[str]
+    ) -> List[StoredScript]:
+        """单次查询取回多个仿真实例下的脚本（按 created_at 排序）。"""
+        simulation_ids = list(simulation_ids)
+        if not simulation_ids:
+            return []
+        return await self._fetch_scripts(
+            "simulation_id = ANY($1::text[])", simulation_ids
         )
-        schema_ident = quote_identifier(self._schema)
-        table_ident = quote_identifier(self._table)
-        qualified = f"{schema_ident}.{table_ident}"
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                f"""
-                SELECT script_id, simulation_id, user_id, description, created_at, code, code_version, agent_kind, entity_id, last_failure_at, last_failure_reason
-                FROM {qualified}
-                WHERE simulation_id = $1
-                ORDER BY created_at
-                """,
-                simulation_id,
-            )
-        scripts: List[StoredScript] = []
-        for row in rows:
-            metadata = ScriptMetadata(
-                script_id=str(row["script_id"]),
-                simulation_id=row["simulation_id"],
-                user_id=row["user_id"],
-                description=row["description"],
-                created_at=row["created_at"],
-                code_version=str(row["code_version"]),
-                agent_kind=AgentKind(row["agent_kind"]),
-                entity_id=row["entity_id"],
-                last_failure_at=row["last_failure_at"],
-                last_failure_reason=row["last_failure_reason"],
-            )
-            scripts.append(StoredScript(metadata=metadata, code=row["code"]))
-        return scripts
 
     async def fetch_user_scripts(self, user_id: str) -> List[StoredScript]:
+        return await self._fetch_scripts("user_id = $1", user_id)
+
+    async def _fetch_scripts(self, condition: str, arg: object) -> List[StoredScript]:
         await self._ensure_schema()
         pool = await get_pool(
             self._dsn, min_size=self._min_pool, max_size=self._max_pool
@@ -214,27 +212,12 @@ class PostgresScriptStore:
                 f"""
                 SELECT script_id, simulation_id, user_id, description, created_at, code, code_version, agent_kind, entity_id, last_failure_at, last_failure_reason
                 FROM {qualified}
-                WHERE user_id = $1
+                WHERE {condition}
                 ORDER BY created_at
                 """,
-                user_id,
-            )
-        scripts: List[StoredScript] = []
-        for row in rows:
-            metadata = ScriptMetadata(
-                script_id=str(row["script_id"]),
-                simulation_id=row["simulation_id"],
-                user_id=row["user_id"],
-                description=row["description"],
-                created_at=row["created_at"],
-                code_version=str(row["code_version"]),
-                agent_kind=AgentKind(row["agent_kind"]),
-                entity_id=row["entity_id"],
-                last_failure_at=row["last_failure_at"],
-                last_failure_reason=row["last_failure_reason"],
+                arg,
             )
-            scripts.append(StoredScript(metadata=metadata, code=row["code"]))
-        return scripts
+        return [_row_to_stored_script(row) for row in rows]
 
     async def update_simulation_binding(
         self, script_id: str, simulation_id: Optional[str]
@@ -25,6 +25,7 @@ from typing import (
     List,
     Optional,
     Protocol,
+    Sequence,
     Set,
     TYPE_CHECKING,
 )
@@ -100,6 +101,10 @@ class ScriptStore(Protocol):
         self, simulation_id: str
     ) -> List["StoredScript"]: ...
 
+    async def fetch_scripts_for_simulations(
+        self, simulation_ids: Sequence[str]
+    ) -> List["StoredScript"]: ...
+
     async def fetch_user_scripts(self, user_id: str) -> List["StoredScript"]: ...
 
     async def list_all_metadata(self) -> List[ScriptMetadata]: ...
@@ -383,6 +388,49 @@ class ScriptRegistry:
                 self._simulation_index.setdefault(simulation_id, set())
                 self._loaded_simulations.add(simulation_id)
 
+    async def _ensure_simulations_loaded(self, simulation_ids: Sequence[str]) -> None:
+        pending = [
+            simulation_id
+            for simulation_id in dict.fromkeys(simulation_ids)
+            if simulation_id not in self._loaded_simulations
+        ]
+        if len(pending) <= 1 or self._store is None:
+            for simulation_id in pending:
+                await self._ensure_simulation_loaded(simulation_id)
+            return
+
+        async with self._load_lock:
+            pending = [
+                simulation_id
+                for simulation_id in pending
+                if simulation_id not in self._loaded_simulations
+            ]
+            if not pending:
+                return
+            try:
+                stored_scripts = await self._store.fetch_scripts_for_simulations(
+                    pending
+                )
+            except Exception as exc:
+                logger.error(
+                    "Failed to load scripts for simulations %s; "
+                    "falling back to per-simulation loads",
+                    ", ".join(pending),
+                    exc_info=exc,
+                )
+            else:
+                await self._ingest_stored_scripts(stored_scripts)
+                async with self._registry_lock:
+                    for simulation_id in pending:
+                        self._simulation_index.setdefault(simulation_id, set())
+                        self._loaded_simulations.add(simulation_id)
+                return
+
+        # _ensure_simulation_loaded takes _load_lock itself, so fall back
+        # only after the batched attempt has released it.
+        for simulation_id in pending:
+            await self._ensure_simulation_loaded(simulation_id)
+
     async def _ensure_user_loaded(self, user_id: str) -> None:
         if user_id in self._loaded_users:
             return
@@ -847,6 +895,27 @@ class ScriptRegistry:
             key=lambda meta: meta.created_at,
         )
 
+    async def list_scripts_for_simulations(
+        self, simulation_ids: Iterable[str]
+    ) -> Dict[str, List[ScriptMetadata]]:
+        """批量列出多个仿真实例下的脚本；未加载的实例只需一次存储查询。"""
+
+        simulation_ids = list(dict.fromkeys(simulation_ids))
+        await self._ensure_simulations_loaded(simulation_ids)
+        async with self._registry_lock:
+            grouped = {
+                simulation_id: [
+                    self._records[script_id].metadata
+                    for script_id in self._simulation_index.get(simulation_id, set())
+                    if script_id in self._records
+                ]
+                for simulation_id in simulation_ids
+            }
+        return {
+            simulation_id: sorted(metas, key=lambda meta: meta.created_at)
+            for simulation_id, metas in grouped.items()
+        }
+
     async def list_user_scripts(self, user_id: str) -> List[ScriptMetadata]:
         """返回指定用户上传的所有脚本（包含未挂载仿真）。"""
 
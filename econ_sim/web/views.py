@@ -58,6 +58,16 @@ _templates = Jinja2Templates(
 _orchestrator: Optional[SimulationOrchestrator] = None
 _background_jobs: Optional[BackgroundJobManager] = None
 
+
+async def _get_orchestrator() -> SimulationOrchestrator:
+    """路由依赖：返回当前注入的 orchestrator。
+
+    测试可通过 `app.dependency_overrides[views._get_orchestrator]` 替换，
+    无需改写模块级 `_orchestrator`。
+    """
+    return _orchestrator
+
+
 _DOCS_ROOT = Path(__file__).resolve().parents[2] / "docs" / "user_strategies"
 _STATIC_ROOT = Path(__file__).resolve().parent / "static"
 _AVATAR_DIR = _STATIC_ROOT / "avatars"
@@ -72,14 +82,14 @@ ROLE_DOC_FILES: Dict[str, Dict[str, str]] = {
 }
 
 
-def _get_ticks_per_day_default() -> int:
+def _get_ticks_per_day_default(orchestrator: SimulationOrchestrator) -> int:
     """获取默认的 ticks_per_day。
 
     优先从 orchestrator.config 读取；当测试使用 DummyOrchestrator 无该属性时，
     回退到全局 world 配置。
     """
     try:
-        cfg = getattr(_orchestrator, "config", None)
+        cfg = getattr(orchestrator, "config", None)
         if cfg and getattr(cfg, "simulation", None):
             return int(cfg.simulation.ticks_per_day)
     except Exception:  # pragma: no cover - 防御性兜底
@@ -176,12 +186,12 @@ async def _require_admin_user(request: Request) -> Dict[str, Any]:
 
 
 async def _load_world_state(
-    simulation_id: str, *, allow_create: bool
+    orchestrator: SimulationOrchestrator, simulation_id: str, *, allow_create: bool
 ) -> Dict[str, Any]:
     if allow_create:
-        state = await _orchestrator.create_simulation(simulation_id)
+        state = await orchestrator.create_simulation(simulation_id)
     else:
-        state = await _orchestrator.get_state(simulation_id)
+        state = await orchestrator.get_state(simulation_id)
     return state.model_dump(mode="json")
 
 
@@ -458,7 +468,10 @@ async def _bounded_gather(coros: Iterable, *, limit: int = 10):
 
 
 async def _build_script_tick_map(
-    current_simulation_id: str, current_tick: Optional[int], user_scripts: Iterable
+    orchestrator: SimulationOrchestrator,
+    current_simulation_id: str,
+    current_tick: Optional[int],
+    user_scripts: Iterable,
 ) -> Dict[str, Optional[int]]:
     result: Dict[str, Optional[int]] = {}
     if current_simulation_id and current_tick is not None:
@@ -473,7 +486,7 @@ async def _build_script_tick_map(
 
     async def _fetch_tick(sid: str):
         try:
-            state = await _orchestrator.get_state(sid)
+            state = await orchestrator.get_state(sid)
         except SimulationNotFoundError:
             return (sid, None)
         else:
@@ -551,7 +564,10 @@ def _normalize_email_for_filename(email: str) -> str:
 
 @router.get("/profile", response_class=HTMLResponse)
 async def profile_page(
-    request: Request, message: Optional[str] = None, error: Optional[str] = None
+    request: Request,
+    message: Optional[str] = None,
+    error: Optional[str] = None,
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ) -> HTMLResponse:
     user = await _require_session_user(request)
     profile = await user_manager.get_profile(user["email"])  # type: ignore[index]
@@ -566,7 +582,7 @@ async def profile_page(
 
         async def _fetch_failures(sid: str):
             try:
-                return await _orchestrator.list_recent_script_failures(sid, limit=50)
+                return await orchestrator.list_recent_script_failures(sid, limit=50)
             except Exception:
                 return []
 
@@ -880,14 +896,14 @@ async def dashboard(
     tab: Optional[str] = None,
     message: Optional[str] = None,
     error: Optional[str] = None,
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ) -> HTMLResponse:
     allow_create = user["user_type"] == "admin"
-    all_simulations = await _orchestrator.list_simulations()
     user_scripts: List = []
     attachable_scripts: List = []
     features_by_sim: Dict[str, Optional[Dict[str, Any]]] = {}
     household_counts_by_sim: Dict[str, int] = {}
-    ticks_per_day_default = _get_ticks_per_day_default()
+    ticks_per_day_default = _get_ticks_per_day_default(orchestrator)
     remaining_ticks_by_sim: Dict[str, Optional[int]] = {}
     user_profiles: List[Any] = []
     user_type_index: Dict[str, str] = {}
@@ -896,12 +912,16 @@ async def dashboard(
     all_scripts: List = []
     script_failures: List = []
     base_form_defaults = _default_script_form_defaults(user["user_type"])
+    # The initial reads are independent of each other, so issue them together.
     if allow_create:
-        user_profiles = await user_manager.list_users()
+        all_simulations, user_profiles, all_scripts = await asyncio.gather(
+            orchestrator.list_simulations(),
+            user_manager.list_users(),
+            script_registry.list_all_scripts(),
+        )
         user_type_index = {
             profile.email.lower(): profile.user_type for profile in user_profiles
         }
-        all_scripts = await script_registry.list_all_scripts()
         for metadata in all_scripts:
             scripts_by_user.setdefault(metadata.user_id, []).append(metadata)
             sim_id = metadata.simulation_id
@@ -929,17 +949,20 @@ async def dashboard(
             )
             for sid, count in pairs:
                 household_counts_by_sim[sid] = count
-
-    if not allow_create:
-        user_scripts = await script_registry.list_user_scripts(user["email"])
+    else:
+        all_simulations, user_scripts = await asyncio.gather(
+            orchestrator.list_simulations(),
+            script_registry.list_user_scripts(user["email"]),
+        )
         attachable_scripts = [
             script for script in user_scripts if not script.simulation_id
         ]
-    elif all_simulations:
+
+    if allow_create and all_simulations:
 
         async def _fetch_features(sid: str):
             try:
-                fm = await _orchestrator.get_simulation_features(sid)
+                fm = await orchestrator.get_simulation_features(sid)
                 return (sid, fm.model_dump(mode="json"))
             except SimulationNotFoundError:
                 return (sid, None)
@@ -960,9 +983,11 @@ async def dashboard(
     limits_by_sim: Dict[str, Optional[int]] = {}
     script_limit: Optional[int] = None
 
-    if allow_create:
-        for sid in all_simulations:
-            limits_by_sim[sid] = await script_registry.get_simulation_limit(sid)
+    if allow_create and all_simulations:
+        limits = await _bounded_gather(
+            [script_registry.get_simulation_limit(sid) for sid in all_simulations]
+        )
+        limits_by_sim = dict(zip(all_simulations, limits))
 
     if simulation_id:
         if allow_create:
@@ -980,7 +1005,9 @@ async def dashboard(
     show_all = not bool(raw_tab)
 
     if not allow_create and not simulation_id:
-        script_tick_map = await _build_script_tick_map("", None, user_scripts)
+        script_tick_map = await _build_script_tick_map(
+            orchestrator, "", None, user_scripts
+        )
         friendly_message = (
             message or "当前没有可加入的仿真世界，请稍后再试或联系管理员创建新实例。"
         )
@@ -1068,7 +1095,9 @@ async def dashboard(
         )
 
     try:
-        world_state = await _load_world_state(simulation_id, allow_create=False)
+        world_state = await _load_world_state(
+            orchestrator, simulation_id, allow_create=False
+        )
     except SimulationNotFoundError:
         template_name = "admin_dashboard.html" if allow_create else "dashboard.html"
         context: Dict[str, Any] = {"world": {}} if allow_create else {}
@@ -1094,7 +1123,7 @@ async def dashboard(
             )
         simulation_id = resolved_simulation_id
         script_tick_map = await _build_script_tick_map(
-            simulation_id, None, user_scripts
+            orchestrator, simulation_id, None, user_scripts
         )
         return _templates.TemplateResponse(
             request,
@@ -1235,7 +1264,7 @@ async def dashboard(
             # 3) fallback: participants + owner-field scan
             if not matched:
                 try:
-                    participants = await _orchestrator.list_participants(simulation_id)
+                    participants = await orchestrator.list_participants(simulation_id)
                 except Exception:
                     participants = []
                 if user_email in participants:
@@ -1269,12 +1298,12 @@ async def dashboard(
             for profile in user_profiles
         ]
         if simulation_id:
-            script_failures = await _orchestrator.list_recent_script_failures(
+            script_failures = await orchestrator.list_recent_script_failures(
                 simulation_id, limit=50
             )
 
     script_tick_map = await _build_script_tick_map(
-        simulation_id, current_tick, user_scripts
+        orchestrator, simulation_id, current_tick, user_scripts
     )
 
     return _templates.TemplateResponse(
@@ -1323,6 +1352,7 @@ async def dashboard(
 async def join_simulation(
     user: Dict[str, Any] = Depends(_require_session_user),
     simulation_id: str = Form(...),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ) -> RedirectResponse:
     if user.get("user_type") == "admin":
         return _redirect_to_dashboard(
@@ -1338,7 +1368,7 @@ async def join_simulation(
         )
 
     try:
-        await _orchestrator.get_state(target)
+        await orchestrator.get_state(target)
     except SimulationNotFoundError:
         return _redirect_to_dashboard(
             "",
@@ -1356,6 +1386,7 @@ async def admin_create_simulation(
     user: Dict[str, Any] = Depends(_require_admin_user),
     simulation_id: str = Form(""),
     current_simulation_id: str = Form("default-simulation"),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ) -> RedirectResponse:
     desired_id = simulation_id.strip()
     generated = False
@@ -1363,7 +1394,7 @@ async def admin_create_simulation(
         desired_id = f"sim-{uuid.uuid4().hex[:8]}"
         generated = True
     try:
-        await _orchestrator.create_simulation(desired_id)
+        await orchestrator.create_simulation(desired_id)
     except Exception as exc:  # pragma: no cover - defensive
         fallback = current_simulation_id or "default-simulation"
         return _redirect_to_dashboard(fallback, error=f"创建仿真实例失败: {exc}")
@@ -1381,6 +1412,7 @@ async def admin_update_script_limit(
     max_scripts_per_user: str = Form(""),
     submit_action: str = Form("apply"),
     current_simulation_id: str = Form("default-simulation"),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ) -> RedirectResponse:
     target = simulation_id.strip()
     fallback = current_simulation_id.strip() or "default-simulation"
@@ -1400,7 +1432,7 @@ async def admin_update_script_limit(
             limit_value = None
         else:
             limit_value = int(raw_value)
-        applied = await _orchestrator.set_script_limit(target, limit_value)
+        applied = await orchestrator.set_script_limit(target, limit_value)
     except SimulationStateError as exc:
         redirect_target = target or fallback
         return _redirect_to_dashboard(
@@ -1446,6 +1478,7 @@ async def admin_update_features(
     household_shock_asset_std: str = Form(""),
     household_shock_max_fraction: str = Form(""),
     current_simulation_id: str = Form("default-simulation"),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ) -> RedirectResponse:
     target = simulation_id.strip()
     fallback = current_simulation_id.strip() or "default-simulation"
@@ -1488,7 +1521,7 @@ async def admin_update_features(
         if max_fraction is not None:
             updates["household_shock_max_fraction"] = max_fraction
 
-        await _orchestrator.update_simulation_features(target, **updates)
+        await orchestrator.update_simulation_features(target, **updates)
     except ValueError as exc:
         return _redirect_to_dashboard(target, error=str(exc))
     except SimulationStateError as exc:
@@ -1505,7 +1538,7 @@ async def admin_update_features(
             error=f"仿真实例 {target} 不存在，无法更新功能开关。",
         )
 
-    state = await _orchestrator.get_state(target)
+    state = await orchestrator.get_state(target)
     status_label = "已启用" if state.features.household_shock_enabled else "已关闭"
     note = (
         f"仿真实例 {target} 的家户异质性冲击功能 {status_label}，" f"参数已同步更新。"
@@ -1519,10 +1552,11 @@ async def admin_run_tick(
     user: Dict[str, Any] = Depends(_require_admin_user),
     simulation_id: str = Form(""),
     current_simulation_id: str = Form("default-simulation"),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ):
     target = simulation_id.strip() or current_simulation_id or "default-simulation"
     try:
-        result = await _orchestrator.run_tick(target)
+        result = await orchestrator.run_tick(target)
     except SimulationNotFoundError:
         return _async_response(
             request,
@@ -1551,6 +1585,7 @@ async def admin_run_one_day(
     simulation_id: str = Form(...),
     ticks_per_day: str = Form(""),
     current_simulation_id: str = Form("default-simulation"),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ):
     target = simulation_id.strip() or current_simulation_id or "default-simulation"
     custom_ticks: Optional[int] = None
@@ -1566,7 +1601,7 @@ async def admin_run_one_day(
             return _async_response(request, target, error="Tick 数必须大于 0。")
 
     try:
-        result = await _orchestrator.run_day(
+        result = await orchestrator.run_day(
             target,
             ticks_per_day=custom_ticks,
         )
@@ -1600,6 +1635,7 @@ async def admin_run_days(
     simulation_id: str = Form(...),
     days: str = Form(...),
     current_simulation_id: str = Form("default-simulation"),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ):
     target = simulation_id.strip() or current_simulation_id or "default-simulation"
     try:
@@ -1615,7 +1651,7 @@ async def admin_run_days(
         return _async_response(request, target, error="天数必须大于 0。")
 
     try:
-        await _orchestrator.create_simulation(target)
+        await orchestrator.create_simulation(target)
     except SimulationNotFoundError:
         return _async_response(
             request,
@@ -1625,7 +1661,7 @@ async def admin_run_days(
 
     async def _job_factory() -> Dict[str, Any]:
         try:
-            result = await _orchestrator.run_until_day(target, days_required)
+            result = await orchestrator.run_until_day(target, days_required)
         except SimulationNotFoundError:
             raise
         note = _format_tick_progress_message(
@@ -1680,13 +1716,14 @@ async def admin_run_days(
 async def admin_reset_simulation(
     user: Dict[str, Any] = Depends(_require_admin_user),
     simulation_id: str = Form(...),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ) -> RedirectResponse:
     target = simulation_id.strip()
     if not target:
         return _redirect_to_dashboard("default-simulation", error="请指定仿真实例 ID。")
 
     try:
-        state = await _orchestrator.reset_simulation(target)
+        state = await orchestrator.reset_simulation(target)
     except SimulationNotFoundError:
         return _redirect_to_dashboard(
             target,
@@ -1717,6 +1754,7 @@ async def admin_smoke_test(
     user: Dict[str, Any] = Depends(_require_admin_user),
     simulation_id: str = Form(...),
     ticks: str = Form("1"),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ):
     # schedule a light-weight smoke test job that runs a few ticks and returns timing
     target = (simulation_id or "").strip()
@@ -1728,7 +1766,7 @@ async def admin_smoke_test(
     async def _job_factory() -> Dict[str, Any]:
         start = asyncio.get_event_loop().time()
         try:
-            result = await _orchestrator.run_day(target, ticks_per_day=t)
+            result = await orchestrator.run_day(target, ticks_per_day=t)
         except Exception as exc:
             raise
         elapsed = asyncio.get_event_loop().time() - start
@@ -1810,6 +1848,7 @@ async def admin_delete_simulation(
     user: Dict[str, Any] = Depends(_require_admin_user),
     simulation_id: str = Form(...),
     current_simulation_id: str = Form("default-simulation"),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ) -> RedirectResponse:
     target = simulation_id.strip()
     if not target:
@@ -1819,7 +1858,7 @@ async def admin_delete_simulation(
         )
 
     try:
-        result = await _orchestrator.delete_simulation(target)
+        result = await orchestrator.delete_simulation(target)
     except SimulationNotFoundError:
         return _redirect_to_dashboard(
             current_simulation_id or "default-simulation",
@@ -1834,7 +1873,7 @@ async def admin_delete_simulation(
 
     redirect_target = current_simulation_id or "default-simulation"
     if target == redirect_target:
-        remaining = await _orchestrator.list_simulations()
+        remaining = await orchestrator.list_simulations()
         redirect_target = remaining[0] if remaining else "default-simulation"
 
     return _redirect_to_dashboard(redirect_target, message=message)
@@ -1846,12 +1885,13 @@ async def admin_delete_script(
     simulation_id: str = Form(...),
     script_id: str = Form(...),
     current_simulation_id: str = Form("default-simulation"),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ) -> RedirectResponse:
     target = simulation_id.strip()
     redirect_target = current_simulation_id or target or "default-simulation"
     try:
         if target:
-            await _orchestrator.remove_script_from_simulation(target, script_id)
+            await orchestrator.remove_script_from_simulation(target, script_id)
             note = f"已删除仿真实例 {target} 下的脚本 {script_id}。"
         else:
             await script_registry.delete_script_by_id(script_id)
@@ -1904,6 +1944,7 @@ async def upload_script(
     agent_kind: Optional[str] = Form(None),
     entity_id: Optional[str] = Form(None),
     script_file: UploadFile = File(...),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ) -> HTMLResponse:
     normalized_sim_id = (current_simulation_id or "").strip()
     description_text = (description or "").strip()
@@ -1937,7 +1978,7 @@ async def upload_script(
         *,
         status_code: int = 400,
     ) -> HTMLResponse:
-        all_simulations = await _orchestrator.list_simulations()
+        all_simulations = await orchestrator.list_simulations()
         user_scripts = await script_registry.list_user_scripts(user["email"])
         attachable_scripts = [
             script for script in user_scripts if not script.simulation_id
@@ -1956,7 +1997,7 @@ async def upload_script(
         if normalized_sim_id:
             scripts_list = await script_registry.list_scripts(normalized_sim_id)
             try:
-                world_state_model = await _orchestrator.get_state(normalized_sim_id)
+                world_state_model = await orchestrator.get_state(normalized_sim_id)
             except SimulationNotFoundError:
                 context_payload = {}
             else:
@@ -1972,7 +2013,7 @@ async def upload_script(
             log_download_url = f"/web/logs/{normalized_sim_id}/download"
 
         script_tick_map = await _build_script_tick_map(
-            normalized_sim_id, current_tick, user_scripts
+            orchestrator, normalized_sim_id, current_tick, user_scripts
         )
 
         return _templates.TemplateResponse(
@@ -2091,6 +2132,7 @@ async def attach_existing_script(
     user: Dict[str, Any] = Depends(_require_session_user),
     simulation_id: str = Form(...),
     script_id: str = Form(...),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ) -> RedirectResponse:
     if user["user_type"] == "admin":
         return _redirect_to_dashboard(
@@ -2106,12 +2148,12 @@ async def attach_existing_script(
         )
 
     try:
-        await _orchestrator.attach_script_to_simulation(
+        await orchestrator.attach_script_to_simulation(
             simulation_id=target,
             script_id=script_id,
             user_id=user["email"],
         )
-        await _orchestrator.register_participant(target, user["email"])
+        await orchestrator.register_participant(target, user["email"])
     except SimulationStateError as exc:
         return _redirect_to_dashboard(
             target,
@@ -2140,6 +2182,7 @@ async def detach_script(
     script_id: str = Form(...),
     simulation_id: str = Form(...),
     current_simulation_id: str = Form(""),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ) -> RedirectResponse:
     if user["user_type"] == "admin":
         return _redirect_to_dashboard(
@@ -2169,7 +2212,7 @@ async def detach_script(
         )
 
     try:
-        state = await _orchestrator.get_state(target_simulation)
+        state = await orchestrator.get_state(target_simulation)
     except SimulationNotFoundError:
         return _redirect_to_dashboard(
             redirect_target,
@@ -2183,7 +2226,7 @@ async def detach_script(
         )
 
     try:
-        await _orchestrator.detach_script_from_simulation(
+        await orchestrator.detach_script_from_simulation(
             target_simulation, script_id, user["email"]
         )
     except ScriptExecutionError as exc:
@@ -2202,6 +2245,7 @@ async def rotate_script_at_day_end(
     script_id: str = Form(...),
     new_description: str = Form(""),
     script_file: UploadFile = File(...),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ):
     if user["user_type"] == "admin":
         return _redirect_to_dashboard(
@@ -2231,7 +2275,7 @@ async def rotate_script_at_day_end(
         return _redirect_to_dashboard(target, error="脚本文件必须为 UTF-8 编码。")
 
     try:
-        updated = await _orchestrator.update_script_code_at_day_end(
+        updated = await orchestrator.update_script_code_at_day_end(
             target,
             script_id=script_id,
             user_id=user.get("email"),
@@ -2261,6 +2305,7 @@ async def delete_script(
     user: Dict[str, Any] = Depends(_require_session_user),
     script_id: str = Form(...),
     current_simulation_id: str = Form(""),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ) -> RedirectResponse:
     if user["user_type"] == "admin":
         return _redirect_to_dashboard(
@@ -2284,7 +2329,7 @@ async def delete_script(
         allowed = True
     else:
         try:
-            state = await _orchestrator.get_state(metadata.simulation_id)
+            state = await orchestrator.get_state(metadata.simulation_id)
         except SimulationNotFoundError:
             allowed = True
         else:
@@ -2304,7 +2349,7 @@ async def delete_script(
 
     try:
         if metadata.simulation_id is not None:
-            await _orchestrator.remove_script_from_simulation(
+            await orchestrator.remove_script_from_simulation(
                 metadata.simulation_id, script_id
             )
         else:
@@ -2419,6 +2464,7 @@ async def download_recent_logs(
     simulation_id: str,
     limit: int = 500,
     user: Dict[str, Any] = Depends(_require_session_user),
+    orchestrator: SimulationOrchestrator = Depends(_get_orchestrator),
 ):
     target = simulation_id.strip()
     if not target:
@@ -2428,12 +2474,12 @@ async def download_recent_logs(
 
     try:
         if user.get("user_type") != "admin":
-            participants = await _orchestrator.list_participants(target)
+            participants = await orchestrator.list_participants(target)
             if user.get("email") not in participants:
                 raise HTTPException(
                     status_code=403, detail="只有加入该仿真实例的用户才能下载日志。"
                 )
-        logs = await _orchestrator.get_recent_logs(target, limit=limit)
+        logs = await orchestrator.get_recent_logs(target, limit=limit)
     except SimulationNotFoundError as exc:
         raise HTTPException(
             status_code=404, detail="仿真实例不存在或尚未初始化。"
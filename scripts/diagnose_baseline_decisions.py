@@ -1,40 +1,12 @@
 from econ_sim.utils.settings import get_world_config
-from econ_sim.core.entity_factory import (
-    create_household_state,
-    create_firm_state,
-    create_bank_state,
-    create_government_state,
-    create_central_bank_state,
-    create_macro_state,
-)
+from econ_sim.core.entity_factory import create_sample_world
 from econ_sim.logic_modules import baseline_stub
 from econ_sim.core.orchestrator import run_tick_new
 
 
 def build_sample_world(num_households: int = 6):
-    cfg = get_world_config()
-    households = {}
-    for hid in range(num_households):
-        households[hid] = create_household_state(cfg, hid)
-
-    firm = create_firm_state(cfg, "firm_1")
-    bank = create_bank_state(cfg, "bank", households)
-    gov = create_government_state(cfg, "government")
-    cb = create_central_bank_state(cfg, "central_bank")
-    macro = create_macro_state()
-
-    from econ_sim.data_access.models import WorldState
-
-    return WorldState(
-        simulation_id="diag",
-        tick=0,
-        day=1,
-        households=households,
-        firm=firm,
-        bank=bank,
-        government=gov,
-        central_bank=cb,
-        macro=macro,
+    return create_sample_world(
+        get_world_config(), num_households, simulation_id="diag", tick=0
     )
 
 
@@ -2,7 +2,11 @@
 
 Conventions and fixtures
 - `client` : shared TestClient for synchronous web tests.
+- `aclient` : shared httpx AsyncClient for async web tests; requests run on
+    the same session event loop as the test's own setup coroutines.
 - `override_user` : helper to temporarily override the app's user dependency.
+- `override_orchestrator` : helper to temporarily override the orchestrator
+    dependency used by the web views.
 - `patch` : general-purpose alias for pytest's `monkeypatch` fixture. Prefer
     using `patch` in tests instead of naming the parameter `monkeypatch` so the
     intent is clearer and easier to refactor project-wide.
@@ -12,6 +16,8 @@ Conventions and fixtures
     patch the script registry functions.
 - `patch_views_orchestrator` : semantic wrapper for tests that patch objects
     attached to `econ_sim.web.views` (keeps tests explicit about their target).
+- `isolated_registry` : gives the test its own in-memory `ScriptRegistry`
+    behind the module-level `script_registry` proxy.
 
 When adding new tests, prefer one of the semantic fixtures (`patch_orchestrator`,
 `patch_script_registry`, `patch_views_orchestrator`) when the test clearly targets
@@ -37,13 +43,43 @@ import asyncio
 from typing import Callable, Dict
 
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 import os
 
 from econ_sim.main import app
 from econ_sim.web import views
+from econ_sim import script_engine
 from econ_sim.script_engine import sandbox
 from econ_sim.script_engine import reset_script_registry
+from econ_sim.script_engine.registry import ScriptRegistry
+
+
+def _uvloop_factory():
+    """返回 uvloop 的事件循环工厂；Windows 或未安装 uvloop 时返回 None。"""
+    if sys.platform == "win32":
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
+_UVLOOP_TEST_MODULES = frozenset({"test_web.py"})
+
+
+def pytest_asyncio_loop_factories(config, item):
+    """pytest-asyncio 钩子：只让异步 web 测试跑在 uvloop 上。
+
+    钩子一旦实现就必须为每个异步测试返回工厂，因此其余模块显式使用 asyncio
+    默认循环，行为与未配置时一致；不修改全局事件循环策略。
+    """
+    factory = _uvloop_factory()
+    if factory is not None and item.path.name in _UVLOOP_TEST_MODULES:
+        return {"uvloop": factory}
+    return {"asyncio": asyncio.new_event_loop}
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -72,8 +108,27 @@ def client():
             resp = client.get("/")
             assert resp.status_code == 200
     说明：此 fixture 为 session 级别共享对象，避免在每个测试里重复创建 TestClient。
+    以上下文管理器方式进入，使应用 lifespan 在整个会话中只启动/关闭一次；
+    各测试的依赖覆盖由 `override_user` 在 teardown 时恢复，不会泄漏到共享 client。
+    """
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def aclient():
+    """会话级共享的 AsyncClient，供异步 web 测试使用。
+
+    示例：
+        @pytest.mark.asyncio(loop_scope="session")
+        async def test_upload(aclient):
+            resp = await aclient.post("/web/scripts", ...)
+    说明：通过 ASGITransport 直接调用应用，请求与测试中的准备协程运行在同一个
+    session 事件循环上，不经过 TestClient 的 portal 线程。
     """
-    return TestClient(app)
+    transport = ASGITransport(app=app, raise_app_exceptions=True)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
 
 
 @pytest.fixture
@@ -89,15 +144,17 @@ def override_user():
     说明：
     - 会将视图依赖 `views._require_session_user`（及当 user_type 为 admin 时的
       `views._require_admin_user`）替换为返回给定用户的 lambda。测试结束时
-      会自动恢复原有覆盖，避免污染其它测试。
+      会自动恢复原有覆盖，避免污染其它测试，测试体内无需 try/finally。
+    - 设置函数返回传入的用户字典，便于写成 `user = override_user({...})`。
     """
 
     original = dict(app.dependency_overrides)
 
-    def _set(user: Dict[str, str]) -> None:
+    def _set(user: Dict[str, str]) -> Dict[str, str]:
         app.dependency_overrides[views._require_session_user] = lambda: user
         if user.get("user_type") == "admin":
             app.dependency_overrides[views._require_admin_user] = lambda: user
+        return user
 
     yield _set
 
@@ -106,6 +163,31 @@ def override_user():
     app.dependency_overrides.update(original)
 
 
+@pytest.fixture
+def override_orchestrator():
+    """返回一个设置函数，用于在测试中临时替换 web 视图使用的 orchestrator。
+
+    用法示例：
+        def test_logs(client, override_orchestrator):
+            override_orchestrator(DummyOrchestrator())
+            resp = client.get("/web/logs/sim-1/download")
+
+    说明：
+    - 通过 `app.dependency_overrides[views._get_orchestrator]` 注入替身，
+      不修改模块级 `views._orchestrator`。测试结束时恢复原有覆盖。
+    """
+
+    original = dict(app.dependency_overrides)
+
+    def _set(orchestrator: object) -> None:
+        app.dependency_overrides[views._get_orchestrator] = lambda: orchestrator
+
+    yield _set
+
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(original)
+
+
 @pytest.fixture
 def patch_orchestrator(monkeypatch):
     """辅助 fixture：用于替换或打桩与 orchestrator 相关的行为。
@@ -161,6 +243,25 @@ def patch_views_orchestrator(monkeypatch):
     return monkeypatch
 
 
+@pytest.fixture
+def isolated_registry(monkeypatch):
+    """为当前测试替换一个全新的内存 ScriptRegistry。
+
+    用法示例：
+        def test_upload(client, isolated_registry):
+            ...
+            assert await isolated_registry.list_user_scripts("a@x.com")
+
+    说明：`script_registry` 是转发到 `script_engine._registry_instance` 的代理，
+    因此替换该实例即可让视图与测试代码看到同一个隔离的脚本库；测试结束时由
+    monkeypatch 恢复原实例。各测试不再共享脚本/实体索引，无需调用 `clear()`，
+    也可以在 pytest-xdist 下并行运行。
+    """
+    registry = ScriptRegistry()
+    monkeypatch.setattr(script_engine, "_registry_instance", registry)
+    return registry
+
+
 @pytest.fixture(scope="module", autouse=True)
 def ensure_clean_pool_between_modules():
     """Module-scoped fixture that ensures the process pool is shutdown after
@@ -184,15 +285,16 @@ def ensure_clean_pool_between_modules():
 
 @pytest.fixture(autouse=True)
 def ensure_views_orchestrator_present(monkeypatch):
-    """Ensure `web.views._orchestrator` is set to a lightweight dummy when
-    not provided by the application startup. This reduces noise from tests
-    that expect a module-level orchestrator to exist when the app startup
-    skips auto-seeding (common under pytest). Tests that need richer
-    behaviour should still patch `views._orchestrator` explicitly.
-
-    The dummy uses an in-memory DataAccessLayer to back simple operations
-    like creating/deleting a simulation so filesystem/DB side-effects are
-    avoided.
+    """Ensure `web.views._orchestrator` is set when not provided by the
+    application startup. This reduces noise from tests that expect a
+    module-level orchestrator to exist when the app startup skips
+    auto-seeding (common under pytest). Tests that need scripted behaviour
+    should still use `override_orchestrator`.
+
+    The default is a real `SimulationOrchestrator` backed by an in-memory
+    DataAccessLayer, so views get the full orchestrator interface (listing
+    simulations, attaching scripts, ...) without filesystem/DB side-effects,
+    even when Redis/Postgres environment variables are set.
     """
     # If tests or app already set an orchestrator, do nothing.
     if getattr(views, "_orchestrator", None) is not None:
@@ -200,31 +302,11 @@ def ensure_views_orchestrator_present(monkeypatch):
         return
 
     # Lazy import to avoid heavy startup at module import time.
+    from econ_sim.core.orchestrator import SimulationOrchestrator
     from econ_sim.data_access.redis_client import DataAccessLayer
 
-    class _DummyOrch:
-        def __init__(self):
-            self.data_access = DataAccessLayer.with_default_store()
-
-        async def create_simulation(self, simulation_id: str):
-            return await self.data_access.reset_simulation(simulation_id)
-
-        async def delete_simulation(self, simulation_id: str):
-            try:
-                return await self.data_access.delete_simulation(simulation_id)
-            except Exception:
-                # tests generally ignore deletion failures during cleanup
-                return 0
-
-        async def list_participants(self, simulation_id: str):
-            return []
-
-        async def get_state(self, simulation_id: str):
-            # return a pydantic-backed WorldState instance
-            return await self.data_access.get_world_state(simulation_id)
-
-    dummy = _DummyOrch()
-    monkeypatch.setattr(views, "_orchestrator", dummy)
+    orchestrator = SimulationOrchestrator(DataAccessLayer.with_in_memory_store())
+    monkeypatch.setattr(views, "_orchestrator", orchestrator)
     try:
         yield
     finally:
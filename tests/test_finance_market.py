@@ -75,3 +75,45 @@ def test_transfer_updates_balances_and_ledgers():
     # firm cash increased accordingly
     assert ws.firm.balance_sheet.cash == pytest.approx(200.0)
     assert any(entry.entry_type == "transfer_out" for entry in ledgers)
+
+
+def test_transfer_batch_caps_each_payment_at_remaining_cash():
+    ws = make_world()
+    ws.households[2] = HouseholdState(id=2, balance_sheet=BalanceSheet(cash=0.0))
+    ws.firm.balance_sheet.cash = 150.0
+    updates, ledgers, log = finance_market.transfer_batch(
+        ws,
+        payer_kind=AgentKind.FIRM,
+        payer_id=ws.firm.id,
+        payee_kind=AgentKind.HOUSEHOLD,
+        payee_ids=["1", "2"],
+        amount=100.0,
+        tick=ws.tick,
+        day=ws.day,
+    )
+    # same outcome as two sequential transfers: 100 then the remaining 50
+    assert ws.households[1].balance_sheet.cash == pytest.approx(600.0)
+    assert ws.households[2].balance_sheet.cash == pytest.approx(50.0)
+    assert ws.firm.balance_sheet.cash == pytest.approx(0.0)
+    # one balance_sheet update for the payer plus one per payee
+    assert [u.agent_id for u in updates] == [ws.firm.id, "1", "2"]
+    assert [e.entry_type for e in ledgers].count("transfer_out") == 1
+    assert log.context["total"] == pytest.approx(150.0)
+
+
+def test_transfer_batch_leaves_state_untouched_when_a_payee_is_unknown():
+    ws = make_world()
+    ws.firm.balance_sheet.cash = 150.0
+    with pytest.raises(KeyError):
+        finance_market.transfer_batch(
+            ws,
+            payer_kind=AgentKind.FIRM,
+            payer_id=ws.firm.id,
+            payee_kind=AgentKind.HOUSEHOLD,
+            payee_ids=["1", "99"],
+            amount=100.0,
+            tick=ws.tick,
+            day=ws.day,
+        )
+    assert ws.households[1].balance_sheet.cash == pytest.approx(500.0)
+    assert ws.firm.balance_sheet.cash == pytest.approx(150.0)
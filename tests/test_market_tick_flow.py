@@ -92,14 +92,7 @@ def test_market_tick_consumption_and_education_applied():
     assert getattr(world.households[0], "is_studying", False) is True
 
 
-from econ_sim.core.entity_factory import (
-    create_household_state,
-    create_firm_state,
-    create_bank_state,
-    create_government_state,
-    create_central_bank_state,
-    create_macro_state,
-)
+from econ_sim.core.entity_factory import create_sample_world
 from econ_sim.utils.settings import get_world_config
 from econ_sim.data_access.models import WorldState
 from econ_sim.core.orchestrator import run_tick_new
@@ -107,28 +100,7 @@ from econ_sim.logic_modules import goods_market
 
 
 def build_sample_world(num_households: int = 6) -> WorldState:
-    cfg = get_world_config()
-    households = {}
-    for hid in range(num_households):
-        households[hid] = create_household_state(cfg, hid)
-
-    firm = create_firm_state(cfg, "firm_1")
-    bank = create_bank_state(cfg, "bank", households)
-    gov = create_government_state(cfg, "government")
-    cb = create_central_bank_state(cfg, "central_bank")
-    macro = create_macro_state()
-
-    return WorldState(
-        simulation_id="test",
-        tick=1,
-        day=1,
-        households=households,
-        firm=firm,
-        bank=bank,
-        government=gov,
-        central_bank=cb,
-        macro=macro,
-    )
+    return create_sample_world(get_world_config(), num_households, simulation_id="test")
 
 
 def test_run_tick_produces_consumption_and_education():
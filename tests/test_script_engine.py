@@ -428,3 +428,94 @@ async def test_limits_are_persisted_via_store() -> None:
 
     await recovered.set_simulation_limit("persisted-sim", None)
     assert "persisted-sim" not in store._limits
+
+
+def _stored_script(script_id: str, simulation_id: str):
+    from datetime import datetime, timezone
+
+    from econ_sim.script_engine.postgres_store import StoredScript
+    from econ_sim.script_engine.registry import ScriptMetadata
+
+    return StoredScript(
+        metadata=ScriptMetadata(
+            script_id=script_id,
+            simulation_id=simulation_id,
+            user_id="batch",
+            description=None,
+            created_at=datetime.now(timezone.utc),
+            code_version="v1",
+            agent_kind=AgentKind.HOUSEHOLD,
+            entity_id=script_id,
+        ),
+        code="""
+def generate_decisions(context):
+    return {}
+""",
+    )
+
+
+class StubScriptStore:
+    def __init__(self, scripts) -> None:
+        self._scripts = list(scripts)
+        self.batch_calls: list[list[str]] = []
+
+    async def fetch_scripts_for_simulations(self, simulation_ids):
+        self.batch_calls.append(list(simulation_ids))
+        return [
+            stored
+            for stored in self._scripts
+            if stored.metadata.simulation_id in simulation_ids
+        ]
+
+    async def fetch_simulation_scripts(self, simulation_id):
+        raise AssertionError("expected a single batched fetch")
+
+
+class FailingBatchScriptStore(StubScriptStore):
+    def __init__(self, scripts) -> None:
+        super().__init__(scripts)
+        self.single_calls: list[str] = []
+
+    async def fetch_scripts_for_simulations(self, simulation_ids):
+        self.batch_calls.append(list(simulation_ids))
+        raise RuntimeError("batched query failed")
+
+    async def fetch_simulation_scripts(self, simulation_id):
+        self.single_calls.append(simulation_id)
+        return [
+            stored
+            for stored in self._scripts
+            if stored.metadata.simulation_id == simulation_id
+        ]
+
+
+@pytest.mark.asyncio
+# 测试：批量列出多个仿真的脚本时只向存储发起一次查询，并按仿真分组返回。
+async def test_list_scripts_for_simulations_uses_one_store_query() -> None:
+    store = StubScriptStore(
+        [_stored_script("1", "sim-x"), _stored_script("2", "sim-y")]
+    )
+    registry = ScriptRegistry(store=store)
+
+    listed = await registry.list_scripts_for_simulations(["sim-x", "sim-y", "sim-z"])
+
+    assert store.batch_calls == [["sim-x", "sim-y", "sim-z"]]
+    assert [m.script_id for m in listed["sim-x"]] == ["1"]
+    assert [m.script_id for m in listed["sim-y"]] == ["2"]
+    assert listed["sim-z"] == []
+
+
+@pytest.mark.asyncio
+# 测试：批量查询失败时逐个仿真回退加载，而不是把它们标记为已加载的空集合。
+async def test_list_scripts_for_simulations_falls_back_when_batch_fails() -> None:
+    store = FailingBatchScriptStore(
+        [_stored_script("1", "sim-x"), _stored_script("2", "sim-y")]
+    )
+    registry = ScriptRegistry(store=store)
+
+    listed = await registry.list_scripts_for_simulations(["sim-x", "sim-y"])
+
+    assert store.batch_calls == [["sim-x", "sim-y"]]
+    assert store.single_calls == ["sim-x", "sim-y"]
+    assert [m.script_id for m in listed["sim-x"]] == ["1"]
+    assert [m.script_id for m in listed["sim-y"]] == ["2"]
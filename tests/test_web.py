@@ -1,14 +1,14 @@
 from datetime import datetime, timezone
+import os
 from types import SimpleNamespace
-from typing import Dict, Optional
+from typing import Dict, NamedTuple, Optional
 import urllib.parse
 
 import pytest
+import pytest_asyncio
 import asyncio
 import re
 
-from fastapi.testclient import TestClient
-
 from econ_sim.main import app
 from econ_sim.web import views
 from econ_sim.data_access.models import AgentKind
@@ -24,16 +24,16 @@ SCRIPT_SOURCE = (
     "    builder = OverridesBuilder()\n"
     "    return builder.build()\n"
 )
+SCRIPT_SOURCE_BYTES = SCRIPT_SOURCE.encode("utf-8")
+_SCRIPT_FILE = {"script_file": ("demo.py", SCRIPT_SOURCE_BYTES, "text/x-python")}
 
+_HOUSEHOLD_COUNT_RE = re.compile(r'class="household-count"[^>]*>\s*(\d+)\s*户')
+# 上限在模板中与标签渲染在同一行，限定在单行内匹配，避免跨整页 HTML 扫描。
+_SCRIPT_LIMIT_RE = re.compile(r"脚本上限[^\n]*?(\d+)")
 
-def _build_world_state_dump(
-    simulation_id: str = "sim-main",
-    *,
-    tick: int = 0,
-    day: int = 0,
-    households: Optional[Dict[int, Dict[str, object]]] = None,
-) -> Dict[str, object]:
-    household_payload = households or {
+
+def _world_state_template() -> Dict[str, object]:
+    household_payload = {
         1: {
             "id": 1,
             "balance_sheet": {
@@ -51,9 +51,9 @@ def _build_world_state_dump(
     }
 
     return {
-        "simulation_id": simulation_id,
-        "tick": tick,
-        "day": day,
+        "simulation_id": "sim-main",
+        "tick": 0,
+        "day": 0,
         "households": household_payload,
         "firm": {
             "price": 10.0,
@@ -113,1078 +113,909 @@ def _build_world_state_dump(
     }
 
 
-# client, override_user 等 fixtures 已移动到 tests/conftest.py
-# 直接使用 pytest fixture: override_user, client
+_WORLD_STATE_TEMPLATE = _world_state_template()
+# `_prepare_world_for_template` 只会对这几个 agent 子字典调用 setdefault。
+_TEMPLATE_MUTATED_AGENT_KEYS = ("firm", "bank", "government", "central_bank")
 
 
-def test_download_logs_success(patch_orchestrator, client, override_user):
-    # 测试：当用户为 simulation 的参与者时，下载日志端点应返回 200 并包含日志内容与上下文。
-    user = {"email": "player@example.com", "user_type": "individual"}
-    override_user(user)
+def _build_world_state_dump(
+    simulation_id: str = "sim-main",
+    *,
+    tick: int = 0,
+    day: int = 0,
+    households: Optional[Dict[int, Dict[str, object]]] = None,
+) -> Dict[str, object]:
+    """基于模块级模板浅拷贝出一份世界状态快照，仅覆盖调用方关心的字段。
 
-    entries = [
-        SimpleNamespace(tick=12, day=3, message="tick ok", context={"foo": "bar"}),
-        SimpleNamespace(tick=13, day=3, message="tick warn", context=None),
-    ]
+    视图只会原地修改 `_TEMPLATE_MUTATED_AGENT_KEYS` 对应的子字典，因此只复制这几项，
+    其余嵌套结构与模板共享，调用方应视为只读。
+    """
+    dump = {
+        **_WORLD_STATE_TEMPLATE,
+        "simulation_id": simulation_id,
+        "tick": tick,
+        "day": day,
+    }
+    for key in _TEMPLATE_MUTATED_AGENT_KEYS:
+        dump[key] = dict(dump[key])
+    if households:
+        dump["households"] = households
+    return dump
 
-    class DummyOrchestrator:
-        async def list_participants(self, simulation_id):
-            assert simulation_id == "sim-1"
-            return ["player@example.com"]
 
-        async def get_recent_logs(self, simulation_id, limit=None):
-            assert simulation_id == "sim-1"
-            assert limit == 500
-            return entries
+class _DashboardFeatures:
+    __slots__ = ("household_shock_enabled",)
 
-    patch_orchestrator.setattr(views, "_orchestrator", DummyOrchestrator())
+    def __init__(self, enabled: bool = False) -> None:
+        self.household_shock_enabled = enabled
 
-    try:
-        response = client.get("/web/logs/sim-1/download")
-        assert response.status_code == 200
-        assert "Day 3" in response.text
-        assert 'context={"foo": "bar"}' in response.text
-    finally:
-        pass
+    def model_dump(self, mode: str = "json"):
+        return {
+            "household_shock_enabled": self.household_shock_enabled,
+            "household_shock_ability_std": 0.08,
+            "household_shock_asset_std": 0.05,
+            "household_shock_max_fraction": 0.4,
+        }
 
 
-def test_dashboard_displays_script_limit(client, override_user, patch_orchestrator):
-    # 测试：仪表盘页面应显示并反映指定 simulation 的脚本上限信息。
-    async def _setup() -> None:
-        await views._orchestrator.create_simulation("sim-limit")
-        await script_registry.set_simulation_limit("sim-limit", 2)
+class _DashboardWorldState:
+    __slots__ = ("simulation_id", "dump_kwargs")
 
-    user = {"email": "player@example.com", "user_type": "individual"}
-    override_user(user)
+    def __init__(self, simulation_id: str, **dump_kwargs) -> None:
+        self.simulation_id = simulation_id
+        self.dump_kwargs = dump_kwargs
 
-    asyncio.run(_setup())
+    def model_dump(self, mode: str = "json"):
+        return _build_world_state_dump(self.simulation_id, **self.dump_kwargs)
 
-    try:
-        response = client.get("/web/dashboard?simulation_id=sim-limit")
-        assert response.status_code == 200
-        assert "当前脚本上限" in response.text
-        assert re.search(r"脚本上限[\s\S]*2", response.text)
-    finally:
-        pass
 
-        async def _cleanup() -> None:
-            await script_registry.clear()
-            try:
-                await views._orchestrator.data_access.delete_simulation("sim-limit")
-            except Exception:
-                pass
+class _DashboardOrchestrator:
+    """仪表盘测试共用的 orchestrator 替身，只认识构造时给出的 simulation。"""
 
-        asyncio.run(_cleanup())
+    __slots__ = ("simulations", "participants", "features_enabled", "dump_kwargs")
 
+    def __init__(
+        self,
+        simulations=("sim-main",),
+        *,
+        participants=(),
+        features_enabled=(),
+        tick: int = 0,
+        day: int = 0,
+        households: Optional[Dict[int, Dict[str, object]]] = None,
+    ) -> None:
+        self.simulations = list(simulations)
+        self.participants = list(participants)
+        self.features_enabled = set(features_enabled)
+        self.dump_kwargs = {"tick": tick, "day": day, "households": households}
 
-def test_upload_script_saved_to_library(client, override_user):
-    # 测试：上传脚本到 /web/scripts 时，应把脚本保存到用户库（simulation_id 为空），并生成占位实体 ID。
-    user = {"email": "player@example.com", "user_type": "individual"}
-    override_user(user)
+    async def list_simulations(self):
+        return self.simulations
 
-    asyncio.run(script_registry.clear())
+    async def get_simulation_features(self, simulation_id):
+        assert simulation_id in self.simulations
+        return _DashboardFeatures(simulation_id in self.features_enabled)
 
-    try:
-        response = client.post(
-            "/web/scripts",
-            data={
-                "current_simulation_id": "sim-upload",
-                "description": "demo",
-            },
-            files={
-                "script_file": ("demo.py", SCRIPT_SOURCE, "text/x-python"),
-            },
-            follow_redirects=False,
-        )
+    async def list_participants(self, simulation_id):
+        assert simulation_id in self.simulations
+        return self.participants
 
-        assert response.status_code == 303
-        location = response.headers.get("location", "")
-        assert "simulation_id=sim-upload" in location
-
-        scripts = asyncio.run(script_registry.list_user_scripts("player@example.com"))
-        assert len(scripts) == 1
-        assert scripts[0].simulation_id is None
-        assert script_registry.is_placeholder_entity_id(scripts[0].entity_id)
-        assert scripts[0].agent_kind is AgentKind.HOUSEHOLD
-    finally:
-        pass
-        asyncio.run(script_registry.clear())
-
-
-def test_detach_script_requires_tick_zero(patch_orchestrator, client, override_user):
-    # 测试：在非 tick 0 时尝试从 simulation 分离脚本应被阻止并返回带 error 的重定向。
-    user = {"email": "player@example.com", "user_type": "individual"}
-    override_user(user)
-
-    asyncio.run(script_registry.clear())
-    metadata = asyncio.run(
-        script_registry.register_script(
-            simulation_id=None,
-            user_id=user["email"],
-            script_code=SCRIPT_SOURCE,
-            description=None,
-            agent_kind=AgentKind.HOUSEHOLD,
-            entity_id="1",
-        )
-    )
-    asyncio.run(
-        script_registry.attach_script(metadata.script_id, "sim-late", user["email"])
-    )
+    async def get_state(self, simulation_id):
+        assert simulation_id in self.simulations
+        return _DashboardWorldState(simulation_id, **self.dump_kwargs)
 
-    ticks = {"sim-late": 3}
+    async def list_recent_script_failures(self, simulation_id: str, limit: int = 50):
+        assert simulation_id in self.simulations
+        return []
 
-    async def fake_get_state(simulation_id: str):
-        if simulation_id not in ticks:
-            raise SimulationNotFoundError()
-        return SimpleNamespace(tick=ticks[simulation_id])
 
-    patch_orchestrator.setattr(views._orchestrator, "get_state", fake_get_state)
+class _StateStub:
+    """只带 tick 的世界状态替身；脚本挂载类视图只读取该字段。"""
 
-    try:
-        response = client.post(
-            "/web/scripts/detach",
-            data={
-                "script_id": metadata.script_id,
-                "simulation_id": "sim-late",
-                "current_simulation_id": "sim-late",
-            },
-            follow_redirects=False,
-        )
+    __slots__ = ("tick",)
 
-        assert response.status_code == 303
-        location = response.headers.get("location", "")
-        assert "error=" in location
+    def __init__(self, tick: int) -> None:
+        self.tick = tick
 
-        meta_after = asyncio.run(
-            script_registry.get_user_script(metadata.script_id, user["email"])
-        )
-        assert meta_after.simulation_id == "sim-late"
-    finally:
-        pass
-        asyncio.run(script_registry.clear())
-
-
-def test_detach_script_allows_tick_zero(patch_orchestrator, client, override_user):
-    # 测试：在 tick 0 时允许从 simulation 分离脚本，分离后元数据中的 simulation_id 应为 None。
-    user = {"email": "player@example.com", "user_type": "individual"}
-    override_user(user)
-
-    asyncio.run(script_registry.clear())
-    metadata = asyncio.run(
-        script_registry.register_script(
-            simulation_id=None,
-            user_id=user["email"],
-            script_code=SCRIPT_SOURCE,
-            description=None,
-            agent_kind=AgentKind.HOUSEHOLD,
-            entity_id="1",
-        )
-    )
-    asyncio.run(
-        script_registry.attach_script(metadata.script_id, "sim-zero", user["email"])
-    )
 
-    ticks = {"sim-zero": 0}
-
-    class DummyOrchestrator:
-        async def get_state(self, simulation_id: str):
-            if simulation_id not in ticks:
-                raise SimulationNotFoundError()
-            return SimpleNamespace(tick=ticks[simulation_id])
-
-        async def detach_script_from_simulation(
-            self, simulation_id: str, script_id: str, user_id: str
-        ) -> None:
-            assert simulation_id == "sim-zero"
-            assert user_id == user["email"]
-            await script_registry.detach_user_script(script_id, user_id)
-
-    patch_orchestrator.setattr(views, "_orchestrator", DummyOrchestrator())
-
-    try:
-        response = client.post(
-            "/web/scripts/detach",
-            data={
-                "script_id": metadata.script_id,
-                "simulation_id": "sim-zero",
-                "current_simulation_id": "sim-zero",
-            },
-            follow_redirects=False,
-        )
+def _make_fake_get_state(ticks: Dict[str, int]):
+    states = {simulation_id: _StateStub(tick) for simulation_id, tick in ticks.items()}
 
-        assert response.status_code == 303
-        meta_after = asyncio.run(
-            script_registry.get_user_script(metadata.script_id, user["email"])
-        )
-        assert meta_after.simulation_id is None
-    finally:
-        pass
-        asyncio.run(script_registry.clear())
+    async def fake_get_state(simulation_id: str):
+        if simulation_id not in states:
+            raise SimulationNotFoundError()
+        return states[simulation_id]
+
+    return fake_get_state
+
+
+class _LifecycleOrchestrator:
+    """记录分离/删除钩子调用的替身，tick 由 `_make_fake_get_state` 提供。"""
+
+    __slots__ = ("get_state", "user_id", "calls")
+
+    def __init__(self, ticks: Dict[str, int], user_id: str) -> None:
+        self.get_state = _make_fake_get_state(ticks)
+        self.user_id = user_id
+        self.calls = []
+
+    async def detach_script_from_simulation(
+        self, simulation_id: str, script_id: str, user_id: str
+    ) -> None:
+        assert user_id == self.user_id
+        self.calls.append(("detach", simulation_id, script_id))
+
+    async def remove_script_from_simulation(
+        self, simulation_id: str, script_id: str
+    ) -> None:
+        self.calls.append(("delete", simulation_id, script_id))
+
+
+def _encode_markers(*markers: str) -> tuple[bytes, ...]:
+    """在导入时把断言片段编码为 UTF-8 字节，供 `_assert_contains_all` 使用。"""
+    return tuple(marker.encode("utf-8") for marker in markers)
+
+
+def _assert_contains_all(body: bytes, needles) -> None:
+    """断言原始响应体包含全部字节片段；失败时一次性列出所有缺失项。
+
+    直接在 `response.content` 上做字节查找，无需把整页 HTML 解码为 str；
+    失败信息中的片段会解码回文本，便于阅读。
+    """
+    missing = [needle.decode("utf-8") for needle in needles if needle not in body]
+    assert not missing, missing
+
+
+def _assert_redirect(response, *, contains=(), status: int = 303) -> str:
+    """断言响应为重定向且 Location 包含给定片段，返回 Location 供进一步检查。
+
+    只读取状态码与响应头，不访问 `response.text`，避免对重定向响应体做解码。
+    """
+    assert response.status_code == status
+    location = response.headers["location"]
+    for fragment in contains:
+        assert fragment in location, location
+    return location
+
+
+def _patch_dashboard_sources(mp, *, users=None, **registry_fakes) -> None:
+    """按方法名一次性替换仪表盘读取的 `script_registry` 方法，可选替换用户列表。"""
+    for name, fake in registry_fakes.items():
+        mp.setattr(script_registry, name, fake)
+    if users is not None:
+        mp.setattr(views.user_manager, "list_users", users)
+
+
+async def _asgi_post(path: str, data: Dict[str, str]) -> SimpleNamespace:
+    """直接以 ASGI 调用发送表单 POST，只收集状态码与响应头。
+
+    仅用于断言重定向的测试：跳过 httpx 的重定向处理与 cookie 合并，
+    返回值与 `_assert_redirect` 所需的 `status_code`/`headers` 接口一致。
+    """
+    body = urllib.parse.urlencode(data).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "server": ("test", 80),
+        "client": ("testclient", 50000),
+        "root_path": "",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [
+            (b"host", b"test"),
+            (b"content-type", b"application/x-www-form-urlencoded"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    result = SimpleNamespace(status_code=None, headers={})
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result.status_code = message["status"]
+            result.headers = {
+                key.decode("latin-1"): value.decode("latin-1")
+                for key, value in message["headers"]
+            }
 
+    await app(scope, receive, send)
+    return result
 
-def test_delete_script_unattached(client, override_user):
-    # 测试：删除未绑定到 simulation 的用户脚本应成功并从用户库中移除。
-    user = {"email": "player@example.com", "user_type": "individual"}
-    override_user(user)
-
-    asyncio.run(script_registry.clear())
-    metadata = asyncio.run(
-        script_registry.register_script(
-            simulation_id=None,
-            user_id=user["email"],
-            script_code=SCRIPT_SOURCE,
-            description=None,
-            agent_kind=AgentKind.HOUSEHOLD,
-            entity_id="1",
-        )
-    )
 
-    try:
-        response = client.post(
-            "/web/scripts/delete",
-            data={
-                "script_id": metadata.script_id,
-                "current_simulation_id": "",
-            },
-            follow_redirects=False,
-        )
+# client, override_user 等 fixtures 已移动到 tests/conftest.py
+# 直接使用 pytest fixture: override_user, client
 
-        assert response.status_code == 303
-        scripts = asyncio.run(script_registry.list_user_scripts(user["email"]))
-        assert not scripts
-    finally:
-        pass
-        asyncio.run(script_registry.clear())
+# pytest-xdist 为每个 worker 设置该环境变量；串行运行时回退为 "master"。
+_WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "master")
 
+_PLAYER = {"email": "player@example.com", "user_type": "individual"}
+_ADMIN = {"email": "admin@example.com", "user_type": "admin"}
 
-def test_delete_script_attached_requires_tick_zero(
-    patch_orchestrator, client, override_user
-):
-    # 测试：当脚本已绑定且 simulation 非 tick 0 时，删除操作应被阻止并返回错误重定向。
-    user = {"email": "player@example.com", "user_type": "individual"}
-    override_user(user)
-
-    asyncio.run(script_registry.clear())
-    metadata = asyncio.run(
-        script_registry.register_script(
-            simulation_id=None,
-            user_id=user["email"],
-            script_code=SCRIPT_SOURCE,
-            description=None,
-            agent_kind=AgentKind.HOUSEHOLD,
-            entity_id="1",
-        )
-    )
-    asyncio.run(
-        script_registry.attach_script(metadata.script_id, "sim-run", user["email"])
-    )
+# 每个测试使用独立的内存脚本库，互不共享状态，因此无需 clear()，也可安全地并行运行。
+pytestmark = pytest.mark.usefixtures("isolated_registry")
 
-    ticks = {"sim-run": 4}
 
-    async def fake_get_state(simulation_id: str):
-        if simulation_id not in ticks:
-            raise SimulationNotFoundError()
-        return SimpleNamespace(tick=ticks[simulation_id])
+@pytest.fixture
+def as_player(override_user):
+    """以普通家户用户 _PLAYER 登录，teardown 由 override_user 负责恢复。"""
+    return override_user(_PLAYER)
 
-    patch_orchestrator.setattr(views._orchestrator, "get_state", fake_get_state)
 
-    try:
-        response = client.post(
-            "/web/scripts/delete",
-            data={
-                "script_id": metadata.script_id,
-                "current_simulation_id": "sim-run",
-            },
-            follow_redirects=False,
-        )
+@pytest.fixture
+def as_admin(override_user):
+    """以管理员 _ADMIN 登录，teardown 由 override_user 负责恢复。"""
+    return override_user(_ADMIN)
 
-        assert response.status_code == 303
-        location = response.headers.get("location", "")
-        assert "error=" in location
-        meta_after = asyncio.run(
-            script_registry.get_user_script(metadata.script_id, user["email"])
-        )
-        assert meta_after.simulation_id == "sim-run"
-    finally:
-        pass
-        asyncio.run(script_registry.clear())
-
-
-def test_delete_script_attached_tick_zero(patch_orchestrator, client, override_user):
-    # 测试：在 tick 0 时删除已绑定脚本应成功并从用户库中删除该脚本。
-    user = {"email": "player@example.com", "user_type": "individual"}
-    override_user(user)
-
-    asyncio.run(script_registry.clear())
-    metadata = asyncio.run(
-        script_registry.register_script(
-            simulation_id=None,
-            user_id=user["email"],
-            script_code=SCRIPT_SOURCE,
-            description=None,
-            agent_kind=AgentKind.HOUSEHOLD,
-            entity_id="1",
-        )
-    )
-    asyncio.run(
-        script_registry.attach_script(metadata.script_id, "sim-reset", user["email"])
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def registered_script(isolated_registry):
+    """在隔离的脚本库中为 _PLAYER 注册一份家户脚本。"""
+    return await script_registry.register_script(
+        simulation_id=None,
+        user_id=_PLAYER["email"],
+        script_code=SCRIPT_SOURCE,
+        description=None,
+        agent_kind=AgentKind.HOUSEHOLD,
+        entity_id="1",
     )
 
-    ticks = {"sim-reset": 0}
 
-    class DummyOrchestrator:
-        async def get_state(self, simulation_id: str):
-            if simulation_id not in ticks:
-                raise SimulationNotFoundError()
-            return SimpleNamespace(tick=ticks[simulation_id])
+@pytest_asyncio.fixture(loop_scope="session")
+async def sim(request):
+    """创建以测试名与 xdist worker 命名的 simulation，测试结束后在同一 orchestrator 上删除。"""
+    orchestrator = views._orchestrator
+    simulation_id = f"sim-{request.node.name}-{_WORKER_ID}"
+    await orchestrator.create_simulation(simulation_id)
+    yield simulation_id
+    await orchestrator.data_access.delete_simulation(simulation_id)
 
-        async def remove_script_from_simulation(
-            self, simulation_id: str, script_id: str
-        ) -> None:
-            assert simulation_id == "sim-reset"
-            await script_registry.delete_user_script(script_id, user["email"])
 
-    patch_orchestrator.setattr(views, "_orchestrator", DummyOrchestrator())
+# 日志下载视图只读取这些条目；context 保持普通 dict，视图会用 json.dumps 序列化它。
+class _FakeLogEntry(NamedTuple):
+    tick: int
+    day: int
+    message: str
+    context: Optional[Dict[str, object]]
 
-    try:
-        response = client.post(
-            "/web/scripts/delete",
-            data={
-                "script_id": metadata.script_id,
-                "current_simulation_id": "sim-reset",
-            },
-            follow_redirects=False,
-        )
 
-        assert response.status_code == 303
-        scripts = asyncio.run(script_registry.list_user_scripts(user["email"]))
-        assert not scripts
-    finally:
-        pass
-        asyncio.run(script_registry.clear())
+_LOG_ENTRIES = (
+    _FakeLogEntry(12, 3, "tick ok", {"foo": "bar"}),
+    _FakeLogEntry(13, 3, "tick warn", None),
+)
 
 
-def test_admin_delete_script_blocked_when_simulation_running(
-    patch_orchestrator, client, override_user
-):
-    # 测试：管理员尝试删除 simulation 中的脚本但 simulation 正在运行（非 tick 0）时应收到合适的错误提示。
-    admin_user = {"email": "admin@example.com", "user_type": "admin"}
-    override_user(admin_user)
-
-    class DummyOrchestrator:
-        async def remove_script_from_simulation(self, simulation_id, script_id):
-            raise SimulationStateError(simulation_id, 5)
-
-    patch_orchestrator.setattr(views, "_orchestrator", DummyOrchestrator())
-
-    try:
-        response = client.post(
-            "/web/admin/scripts/delete",
-            data={
-                "simulation_id": "sim-live",
-                "script_id": "script-123",
-                "current_simulation_id": "sim-live",
-            },
-            follow_redirects=False,
-        )
+class _LogsOrchestrator:
+    """日志下载视图的替身；entries 为 None 时表示不应读取日志。"""
 
-        assert response.status_code == 303
-        location = response.headers.get("location", "")
-        assert location
-        parsed = urllib.parse.urlparse(location)
-        assert parsed.path == "/web/dashboard"
-        params = urllib.parse.parse_qs(parsed.query)
-        assert params.get("simulation_id") == ["sim-live"]
-        assert params.get("error") == [
-            "仿真实例 sim-live 已运行到 tick 5，仅在 tick 0 时允许删除挂载的脚本。"
-        ]
-    finally:
-        pass
-
-
-def test_user_dashboard_displays_role_tables(
-    patch_orchestrator, patch_script_registry, client, override_user
-):
-    # 测试：用户仪表盘应展示角色相关表格以及关键指标（家庭、市场等）。
-    user = {"email": "player@example.com", "user_type": "individual"}
-    override_user(user)
+    __slots__ = ("participants", "entries")
 
-    households = {
-        1: {
-            "id": 1,
-            "balance_sheet": {
-                "cash": 1500.0,
-                "deposits": 500.0,
-                "loans": 120.0,
-                "inventory_goods": 0.0,
-            },
-            "skill": 1.2,
-            "employment_status": "employed_firm",
-            "labor_supply": 1.0,
-            "wage_income": 480.0,
-            "last_consumption": 350.0,
-        },
-        2: {
-            "id": 2,
-            "balance_sheet": {
-                "cash": 900.0,
-                "deposits": 200.0,
-                "loans": 60.0,
-                "inventory_goods": 0.0,
-            },
-            "skill": 0.95,
-            "employment_status": "unemployed",
-            "labor_supply": 1.0,
-            "wage_income": 150.0,
-            "last_consumption": 260.0,
-        },
-    }
+    def __init__(self, participants, entries=None) -> None:
+        self.participants = participants
+        self.entries = entries
 
-    class DummyWorldState:
-        def model_dump(self, mode: str = "json"):
-            return _build_world_state_dump(
-                "sim-main", tick=2, day=1, households=households
-            )
+    async def list_participants(self, simulation_id):
+        assert simulation_id == "sim-1"
+        return self.participants
 
-    class DummyOrchestrator:
-        async def list_simulations(self):
-            return ["sim-main"]
-
-        async def get_state(self, simulation_id: str):
-            assert simulation_id == "sim-main"
-            return DummyWorldState()
-
-    patch_orchestrator.setattr(views, "_orchestrator", DummyOrchestrator())
-
-    now = datetime(2024, 6, 1, tzinfo=timezone.utc)
-    user_scripts = [
-        ScriptMetadata(
-            script_id="script-001",
-            simulation_id="sim-main",
-            user_id=user["email"],
-            description="主要策略",
-            created_at=now,
-            code_version="1.0",
-            agent_kind=AgentKind.HOUSEHOLD,
-            entity_id="1",
-        ),
-        ScriptMetadata(
-            script_id="script-002",
-            simulation_id=None,
-            user_id=user["email"],
-            description="备用策略",
-            created_at=now,
-            code_version="1.1",
-            agent_kind=AgentKind.HOUSEHOLD,
-            entity_id="2",
-        ),
-    ]
+    async def get_recent_logs(self, simulation_id, limit=None):
+        if self.entries is None:
+            pytest.fail("should not fetch logs when user is not a participant")
+        assert simulation_id == "sim-1"
+        assert limit == 500
+        return self.entries
 
-    async def fake_list_user_scripts(email: str):
-        assert email == user["email"]
-        return user_scripts
 
-    async def fake_list_scripts(simulation_id: str):
-        assert simulation_id == "sim-main"
-        return [user_scripts[0]]
+_LOG_MARKERS = _encode_markers("Day 3", 'context={"foo": "bar"}')
 
-    async def fake_get_simulation_limit(simulation_id: str):
-        assert simulation_id == "sim-main"
-        return 3
 
-    patch_script_registry.setattr(
-        script_registry, "list_user_scripts", fake_list_user_scripts
-    )
-    patch_script_registry.setattr(script_registry, "list_scripts", fake_list_scripts)
-    patch_script_registry.setattr(
-        script_registry, "get_simulation_limit", fake_get_simulation_limit
-    )
+@pytest.mark.asyncio(loop_scope="session")
+async def test_download_logs_success(override_orchestrator, aclient, as_player):
+    # 测试：当用户为 simulation 的参与者时，下载日志端点应返回 200 并包含日志内容与上下文。
+    override_orchestrator(_LogsOrchestrator([_PLAYER["email"]], _LOG_ENTRIES))
 
-    try:
-        response = client.get("/web/dashboard?simulation_id=sim-main")
-        assert response.status_code == 200
-        body = response.text
-        assert "角色视角数据" in body
-        assert "市场价格与利率" in body
-        assert "家户平均指标" in body
-        assert "平均现金" in body
-        assert "1,200.00" in body
-        assert "就业率" in body
-    finally:
-        pass
-
-
-def test_admin_dashboard_displays_snapshot_tables(
-    patch_orchestrator, patch_script_registry, client, override_user
-):
-    # 测试：管理员仪表盘应列出各 simulation 的快照信息、用户与脚本统计等。
-    admin_user = {"email": "admin@example.com", "user_type": "admin"}
-    override_user(admin_user)
+    response = await aclient.get("/web/logs/sim-1/download")
+    assert response.status_code == 200
+    _assert_contains_all(response.content, _LOG_MARKERS)
 
-    households = {
-        1: {
-            "id": 1,
-            "balance_sheet": {
-                "cash": 1800.0,
-                "deposits": 700.0,
-                "loans": 150.0,
-                "inventory_goods": 10.0,
-            },
-            "skill": 1.0,
-            "employment_status": "employed_firm",
-            "labor_supply": 1.0,
-            "wage_income": 500.0,
-            "last_consumption": 330.0,
-        }
-    }
 
-    class DummyFeatures:
-        def __init__(self, enabled: bool) -> None:
-            self.household_shock_enabled = enabled
+@pytest.mark.asyncio(loop_scope="session")
+async def test_dashboard_displays_script_limit(aclient, as_player, sim):
+    # 测试：仪表盘页面应显示并反映指定 simulation 的脚本上限信息。
+    await script_registry.set_simulation_limit(sim, 2)
 
-        def model_dump(self, mode: str = "json"):
-            return {
-                "household_shock_enabled": self.household_shock_enabled,
-                "household_shock_ability_std": 0.08,
-                "household_shock_asset_std": 0.05,
-                "household_shock_max_fraction": 0.4,
-            }
+    response = await aclient.get(f"/web/dashboard?simulation_id={sim}")
+    assert response.status_code == 200
+    body = response.text
+    assert "当前脚本上限" in body
+    match = _SCRIPT_LIMIT_RE.search(body)
+    assert match and match.group(1) == "2"
 
-    class DummyWorldState:
-        def __init__(self, simulation_id: str) -> None:
-            self.simulation_id = simulation_id
 
-        def model_dump(self, mode: str = "json"):
-            return _build_world_state_dump(
-                self.simulation_id, tick=4, day=2, households=households
-            )
+@pytest.mark.asyncio(loop_scope="session")
+async def test_upload_script_saved_to_library(aclient, as_player):
+    # 测试：上传脚本到 /web/scripts 时，应把脚本保存到用户库（simulation_id 为空），并生成占位实体 ID。
+    response = await aclient.post(
+        "/web/scripts",
+        data={
+            "current_simulation_id": f"sim-upload-{_WORKER_ID}",
+            "description": "demo",
+        },
+        files=_SCRIPT_FILE,
+        follow_redirects=False,
+    )
 
-    class DummyOrchestrator:
-        async def list_simulations(self):
-            return ["sim-alpha", "sim-beta"]
+    _assert_redirect(response, contains=(f"simulation_id=sim-upload-{_WORKER_ID}",))
 
-        async def get_simulation_features(self, simulation_id: str):
-            return DummyFeatures(enabled=simulation_id == "sim-beta")
+    scripts = await script_registry.list_user_scripts("player@example.com")
+    assert len(scripts) == 1
+    assert scripts[0].simulation_id is None
+    assert script_registry.is_placeholder_entity_id(scripts[0].entity_id)
+    assert scripts[0].agent_kind is AgentKind.HOUSEHOLD
 
-        async def get_state(self, simulation_id: str):
-            return DummyWorldState(simulation_id)
 
-        async def list_recent_script_failures(self, simulation_id, limit=None):
-            return []
+@pytest.mark.asyncio(loop_scope="session")
+async def test_delete_script_unattached(aclient, as_player, registered_script):
+    # 测试：删除未绑定到 simulation 的用户脚本应成功并从用户库中移除。
+    response = await aclient.post(
+        "/web/scripts/delete",
+        data={
+            "script_id": registered_script.script_id,
+            "current_simulation_id": "",
+        },
+        follow_redirects=False,
+    )
 
-    patch_orchestrator.setattr(views, "_orchestrator", DummyOrchestrator())
+    _assert_redirect(response)
+    scripts = await script_registry.list_user_scripts(_PLAYER["email"])
+    assert not scripts
 
-    now = datetime(2024, 6, 1, tzinfo=timezone.utc)
-    scripts = [
-        ScriptMetadata(
-            script_id="household-script",
-            simulation_id="sim-alpha",
-            user_id="indy@example.com",
-            description="居民策略",
-            created_at=now,
-            code_version="1.0",
-            agent_kind=AgentKind.HOUSEHOLD,
-            entity_id="1",
-        ),
-        ScriptMetadata(
-            script_id="firm-script",
-            simulation_id="sim-beta",
-            user_id="firm@example.com",
-            description="企业策略",
-            created_at=now,
-            code_version="2.0",
-            agent_kind=AgentKind.FIRM,
-            entity_id="firm_1",
-        ),
-    ]
 
-    async def fake_list_all_scripts():
-        return scripts
+@pytest.mark.parametrize(
+    ("endpoint", "tick", "expect_detached"),
+    [
+        ("detach", 3, False),
+        ("detach", 0, True),
+        ("delete", 4, False),
+        ("delete", 0, True),
+    ],
+)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_script_lifecycle(
+    endpoint,
+    tick,
+    expect_detached,
+    override_orchestrator,
+    aclient,
+    as_player,
+    registered_script,
+):
+    # 测试：仅当 simulation 处于 tick 0 时才允许分离/删除已挂载脚本，否则返回带 error 的重定向且脚本保持挂载。
+    user = as_player
+    sim_id = f"sim-{endpoint}-{tick}-{_WORKER_ID}"
+    metadata = registered_script
 
-    async def fake_get_simulation_limit(simulation_id: str):
-        return {"sim-alpha": 2}.get(simulation_id)
+    await script_registry.attach_script(metadata.script_id, sim_id, user["email"])
 
-    async def fake_list_users():
-        base_time = datetime(2024, 5, 1, tzinfo=timezone.utc)
-        return [
-            SimpleNamespace(
-                email="admin@example.com",
-                created_at=base_time,
-                user_type="admin",
-            ),
-            SimpleNamespace(
-                email="indy@example.com",
-                created_at=base_time,
-                user_type="individual",
-            ),
-            SimpleNamespace(
-                email="firm@example.com",
-                created_at=base_time,
-                user_type="firm",
-            ),
-        ]
+    orchestrator = _LifecycleOrchestrator({sim_id: tick}, user["email"])
+    override_orchestrator(orchestrator)
 
-    async def fake_list_scripts(simulation_id: str):
-        return [s for s in scripts if s.simulation_id == simulation_id]
+    data = {
+        "script_id": metadata.script_id,
+        "current_simulation_id": sim_id,
+    }
+    if endpoint == "detach":
+        data["simulation_id"] = sim_id
 
-    patch_script_registry.setattr(
-        script_registry, "list_all_scripts", fake_list_all_scripts
-    )
-    patch_script_registry.setattr(
-        script_registry, "get_simulation_limit", fake_get_simulation_limit
+    response = await aclient.post(
+        f"/web/scripts/{endpoint}", data=data, follow_redirects=False
     )
-    patch_script_registry.setattr(script_registry, "list_scripts", fake_list_scripts)
-    patch_orchestrator.setattr(views.user_manager, "list_users", fake_list_users)
-
-    try:
-        response = client.get("/web/dashboard")
-        assert response.status_code == 200
-        body = response.text
-        assert "世界状态快照" in body
-        assert "仿真进度" in body
-        assert "宏观指标" in body
-        assert "家户样本（前 8 户）" in body
-        assert "脚本功能开关" in body
-    finally:
-        pass
-
-
-def test_admin_can_update_script_limit(patch_orchestrator, client, override_user):
-    # 测试：管理员可以通过表单更新指定 simulation 的脚本上限，并能收到确认重定向。
-    admin_user = {"email": "admin@example.com", "user_type": "admin"}
-    override_user(admin_user)
 
-    calls = {}
+    # 脚本状态的实际变更由 orchestrator 负责；这里只需确认视图是否调用了对应钩子。
+    if expect_detached:
+        _assert_redirect(response)
+        assert orchestrator.calls == [(endpoint, sim_id, metadata.script_id)]
+    else:
+        _assert_redirect(response, contains=("error=",))
+        assert orchestrator.calls == []
 
-    class DummyOrchestrator:
-        async def set_script_limit(self, simulation_id, limit):
-            calls["called"] = (simulation_id, limit)
-            return limit
-
-    patch_orchestrator.setattr(views, "_orchestrator", DummyOrchestrator())
-
-    try:
-        response = client.post(
-            "/web/admin/simulations/script_limit",
-            data={
-                "simulation_id": "sim-42",
-                "max_scripts_per_user": "5",
-                "submit_action": "apply",
-                "current_simulation_id": "sim-42",
-            },
-            follow_redirects=False,
-        )
 
-        assert response.status_code == 303
-        assert calls.get("called") == ("sim-42", 5)
-        location = response.headers.get("location", "")
-        assert location.startswith("/web/dashboard")
-        assert "simulation_id=sim-42" in location
-    finally:
-        pass
+# `_redirect_to_dashboard` 用 urlencode 生成 Location，参数顺序固定，可直接整串比较。
+_TICK_BLOCKED_LOCATION = "/web/dashboard?" + urllib.parse.urlencode(
+    {
+        "simulation_id": "sim-live",
+        "error": "仿真实例 sim-live 已运行到 tick 5，仅在 tick 0 时允许删除挂载的脚本。",
+    }
+)
 
 
-def test_admin_dashboard_displays_household_counts(
-    patch_orchestrator, patch_script_registry, client, override_user
+@pytest.mark.asyncio(loop_scope="session")
+async def test_admin_delete_script_blocked_when_simulation_running(
+    override_orchestrator, aclient, as_admin
 ):
-    # 测试：管理员仪表盘应显示按家庭计数的挂载脚本数和相关 DOM 元素。
-    admin_user = {"email": "admin@example.com", "user_type": "admin"}
-    override_user(admin_user)
+    # 测试：管理员尝试删除 simulation 中的脚本但 simulation 正在运行（非 tick 0）时应收到合适的错误提示。
+    async def fake_remove_script_from_simulation(simulation_id, script_id):
+        raise SimulationStateError(simulation_id, 5)
 
-    class DummyFeatures:
-        def model_dump(self, mode: str = "json"):
-            return {"household_shock_enabled": False}
+    override_orchestrator(
+        SimpleNamespace(
+            remove_script_from_simulation=fake_remove_script_from_simulation
+        )
+    )
 
-    class DummyWorldState:
-        def __init__(self) -> None:
-            self.tick = 0
-            self.day = 0
+    response = await aclient.post(
+        "/web/admin/scripts/delete",
+        data={
+            "simulation_id": "sim-live",
+            "script_id": "script-123",
+            "current_simulation_id": "sim-live",
+        },
+        follow_redirects=False,
+    )
 
-        def model_dump(self, mode: str = "json"):
-            return _build_world_state_dump("sim-main", tick=self.tick, day=self.day)
+    assert _assert_redirect(response) == _TICK_BLOCKED_LOCATION
 
-    class DummyOrchestrator:
-        async def list_simulations(self):
-            return ["sim-main"]
 
-        async def get_simulation_features(self, simulation_id):
-            assert simulation_id == "sim-main"
-            return DummyFeatures()
+_DASHBOARD_SCRIPT_TIME = datetime(2024, 6, 1, tzinfo=timezone.utc)
+_USER_DASHBOARD_SCRIPTS = [
+    ScriptMetadata(
+        script_id="script-001",
+        simulation_id="sim-main",
+        user_id=_PLAYER["email"],
+        description="主要策略",
+        created_at=_DASHBOARD_SCRIPT_TIME,
+        code_version="1.0",
+        agent_kind=AgentKind.HOUSEHOLD,
+        entity_id="1",
+    ),
+    ScriptMetadata(
+        script_id="script-002",
+        simulation_id=None,
+        user_id=_PLAYER["email"],
+        description="备用策略",
+        created_at=_DASHBOARD_SCRIPT_TIME,
+        code_version="1.1",
+        agent_kind=AgentKind.HOUSEHOLD,
+        entity_id="2",
+    ),
+]
+
+_SNAPSHOT_SCRIPTS = [
+    ScriptMetadata(
+        script_id="household-script",
+        simulation_id="sim-alpha",
+        user_id="indy@example.com",
+        description="居民策略",
+        created_at=_DASHBOARD_SCRIPT_TIME,
+        code_version="1.0",
+        agent_kind=AgentKind.HOUSEHOLD,
+        entity_id="1",
+    ),
+    ScriptMetadata(
+        script_id="firm-script",
+        simulation_id="sim-beta",
+        user_id="firm@example.com",
+        description="企业策略",
+        created_at=_DASHBOARD_SCRIPT_TIME,
+        code_version="2.0",
+        agent_kind=AgentKind.FIRM,
+        entity_id="firm_1",
+    ),
+]
+
+_SNAPSHOT_USER_TIME = datetime(2024, 5, 1, tzinfo=timezone.utc)
+_SNAPSHOT_USERS = tuple(
+    SimpleNamespace(email=email, created_at=_SNAPSHOT_USER_TIME, user_type=user_type)
+    for email, user_type in (
+        ("admin@example.com", "admin"),
+        ("indy@example.com", "individual"),
+        ("firm@example.com", "firm"),
+    )
+)
 
-        async def list_participants(self, simulation_id):
-            assert simulation_id == "sim-main"
-            return ["household@example.com", "firm@example.com"]
 
-        async def get_state(self, simulation_id):
-            assert simulation_id == "sim-main"
-            return DummyWorldState()
+# 仪表盘视图只读取家户数据（排序时生成新 dict），各测试可直接共享这些模块级常量。
+_ROLE_TABLE_HOUSEHOLDS = {
+    1: {
+        "id": 1,
+        "balance_sheet": {
+            "cash": 1500.0,
+            "deposits": 500.0,
+            "loans": 120.0,
+            "inventory_goods": 0.0,
+        },
+        "skill": 1.2,
+        "employment_status": "employed_firm",
+        "labor_supply": 1.0,
+        "wage_income": 480.0,
+        "last_consumption": 350.0,
+    },
+    2: {
+        "id": 2,
+        "balance_sheet": {
+            "cash": 900.0,
+            "deposits": 200.0,
+            "loans": 60.0,
+            "inventory_goods": 0.0,
+        },
+        "skill": 0.95,
+        "employment_status": "unemployed",
+        "labor_supply": 1.0,
+        "wage_income": 150.0,
+        "last_consumption": 260.0,
+    },
+}
+
+_SNAPSHOT_HOUSEHOLDS = {
+    1: {
+        "id": 1,
+        "balance_sheet": {
+            "cash": 1800.0,
+            "deposits": 700.0,
+            "loans": 150.0,
+            "inventory_goods": 10.0,
+        },
+        "skill": 1.0,
+        "employment_status": "employed_firm",
+        "labor_supply": 1.0,
+        "wage_income": 500.0,
+        "last_consumption": 330.0,
+    }
+}
 
-        async def list_recent_script_failures(self, simulation_id, limit=None):
-            return []
 
-    patch_orchestrator.setattr(views, "_orchestrator", DummyOrchestrator())
+_ROLE_TABLE_MARKERS = _encode_markers(
+    "角色视角数据", "市场价格与利率", "家户平均指标", "平均现金", "1,200.00", "就业率"
+)
+_SNAPSHOT_MARKERS = _encode_markers(
+    "世界状态快照", "仿真进度", "宏观指标", "家户样本（前 8 户）", "脚本功能开关"
+)
 
-    async def fake_list_users():
-        base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
-        return [
-            SimpleNamespace(
-                email="household@example.com",
-                created_at=base_time,
-                user_type="individual",
-            ),
-            SimpleNamespace(
-                email="firm@example.com",
-                created_at=base_time,
-                user_type="firm",
-            ),
-            SimpleNamespace(
-                email="admin@example.com",
-                created_at=base_time,
-                user_type="admin",
-            ),
-        ]
 
-    async def fake_list_all_scripts():
-        return []
+@pytest.mark.asyncio(loop_scope="session")
+async def test_user_dashboard_displays_role_tables(
+    override_orchestrator, patch_script_registry, aclient, as_player
+):
+    # 测试：用户仪表盘应展示角色相关表格以及关键指标（家庭、市场等）。
+    user = as_player
 
-    async def fake_list_scripts(simulation_id):
+    override_orchestrator(
+        _DashboardOrchestrator(tick=2, day=1, households=_ROLE_TABLE_HOUSEHOLDS)
+    )
+
+    user_scripts = _USER_DASHBOARD_SCRIPTS
+
+    async def fake_list_user_scripts(email: str):
+        assert email == user["email"]
+        return user_scripts
+
+    async def fake_list_scripts(simulation_id: str):
         assert simulation_id == "sim-main"
-        return []
+        return [user_scripts[0]]
+
+    async def fake_get_simulation_limit(simulation_id: str):
+        assert simulation_id == "sim-main"
+        return 3
 
-    patch_orchestrator.setattr(views.user_manager, "list_users", fake_list_users)
-    patch_script_registry.setattr(
-        script_registry, "list_all_scripts", fake_list_all_scripts
+    _patch_dashboard_sources(
+        patch_script_registry,
+        list_user_scripts=fake_list_user_scripts,
+        list_scripts=fake_list_scripts,
+        get_simulation_limit=fake_get_simulation_limit,
     )
-    patch_script_registry.setattr(script_registry, "list_scripts", fake_list_scripts)
 
-    try:
-        response = client.get("/web/dashboard?simulation_id=sim-main")
-        assert response.status_code == 200
-        assert "挂载家户脚本数" in response.text
-        assert 'class="household-count"' in response.text
-    finally:
-        pass
+    response = await aclient.get("/web/dashboard?simulation_id=sim-main")
+    assert response.status_code == 200
+    _assert_contains_all(response.content, _ROLE_TABLE_MARKERS)
 
 
-def test_admin_dashboard_household_counts_include_scripts(
-    patch_orchestrator, patch_script_registry, client, override_user
+@pytest.mark.asyncio(loop_scope="session")
+async def test_admin_dashboard_displays_snapshot_tables(
+    override_orchestrator,
+    patch_script_registry,
+    aclient,
+    as_admin,
 ):
-    # 测试：家庭计数统计中应包含每个家庭挂载的脚本数量，页面应反映出脚本计数。
-    admin_user = {"email": "admin@example.com", "user_type": "admin"}
-    override_user(admin_user)
+    # 测试：管理员仪表盘应列出各 simulation 的快照信息、用户与脚本统计等。
 
-    base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
-    script_meta_one = ScriptMetadata(
-        script_id="script-1",
-        simulation_id="sim-main",
-        user_id="household@example.com",
-        description=None,
-        created_at=base_time,
-        code_version="v1",
-        agent_kind=AgentKind.HOUSEHOLD,
-        entity_id="1",
-    )
-    script_meta_two = ScriptMetadata(
-        script_id="script-2",
-        simulation_id="sim-main",
-        user_id="household@example.com",
-        description=None,
-        created_at=base_time,
-        code_version="v2",
-        agent_kind=AgentKind.HOUSEHOLD,
-        entity_id="2",
+    override_orchestrator(
+        _DashboardOrchestrator(
+            ["sim-alpha", "sim-beta"],
+            features_enabled=["sim-beta"],
+            tick=4,
+            day=2,
+            households=_SNAPSHOT_HOUSEHOLDS,
+        )
     )
 
-    class DummyFeatures:
-        def model_dump(self, mode: str = "json"):
-            return {"household_shock_enabled": False}
+    scripts = _SNAPSHOT_SCRIPTS
 
-    class DummyWorldState:
-        def __init__(self, simulation_id: str) -> None:
-            self.simulation_id = simulation_id
-
-        def model_dump(self, mode: str = "json"):
-            return _build_world_state_dump(self.simulation_id)
+    async def fake_list_all_scripts():
+        return scripts
 
-    class DummyOrchestrator:
-        async def list_simulations(self):
-            return ["sim-main"]
+    async def fake_get_simulation_limit(simulation_id: str):
+        return {"sim-alpha": 2}.get(simulation_id)
 
-        async def get_simulation_features(self, simulation_id):
-            assert simulation_id == "sim-main"
-            return DummyFeatures()
+    async def fake_list_users():
+        return _SNAPSHOT_USERS
 
-        async def list_participants(self, simulation_id):
-            assert simulation_id == "sim-main"
-            return []
+    async def fake_list_scripts(simulation_id: str):
+        return [s for s in scripts if s.simulation_id == simulation_id]
 
-        async def get_state(self, simulation_id):
-            assert simulation_id == "sim-main"
-            return DummyWorldState(simulation_id)
+    _patch_dashboard_sources(
+        patch_script_registry,
+        users=fake_list_users,
+        list_all_scripts=fake_list_all_scripts,
+        get_simulation_limit=fake_get_simulation_limit,
+        list_scripts=fake_list_scripts,
+    )
 
-        async def list_recent_script_failures(
-            self, simulation_id: str, limit: int = 50
-        ):
-            assert simulation_id == "sim-main"
-            return []
+    response = await aclient.get("/web/dashboard")
+    assert response.status_code == 200
+    _assert_contains_all(response.content, _SNAPSHOT_MARKERS)
 
-    patch_orchestrator.setattr(views, "_orchestrator", DummyOrchestrator())
 
-    async def fake_list_users():
-        return [
-            SimpleNamespace(
-                email="household@example.com",
-                created_at=base_time,
-                user_type="individual",
-            )
-        ]
+@pytest.mark.asyncio(loop_scope="session")
+async def test_admin_can_update_script_limit(override_orchestrator, aclient, as_admin):
+    # 测试：管理员可以通过表单更新指定 simulation 的脚本上限，并能收到确认重定向。
+    calls = {}
 
-    async def fake_list_all_scripts():
-        return [script_meta_one, script_meta_two]
+    async def fake_set_script_limit(simulation_id, limit):
+        calls["called"] = (simulation_id, limit)
+        return limit
 
-    async def fake_list_scripts(simulation_id):
-        assert simulation_id == "sim-main"
-        return [script_meta_one, script_meta_two]
+    override_orchestrator(SimpleNamespace(set_script_limit=fake_set_script_limit))
 
-    patch_orchestrator.setattr(views.user_manager, "list_users", fake_list_users)
-    patch_script_registry.setattr(
-        script_registry, "list_all_scripts", fake_list_all_scripts
+    response = await aclient.post(
+        "/web/admin/simulations/script_limit",
+        data={
+            "simulation_id": "sim-42",
+            "max_scripts_per_user": "5",
+            "submit_action": "apply",
+            "current_simulation_id": "sim-42",
+        },
+        follow_redirects=False,
     )
-    patch_script_registry.setattr(script_registry, "list_scripts", fake_list_scripts)
 
-    try:
-        response = client.get("/web/dashboard?simulation_id=sim-main")
-        assert response.status_code == 200
-        assert re.search(r'class="household-count"[^>]*>\s*1\s*户', response.text)
-    finally:
-        pass
+    location = _assert_redirect(response, contains=("simulation_id=sim-42",))
+    assert calls.get("called") == ("sim-42", 5)
+    assert location.startswith("/web/dashboard")
 
 
-def test_attach_script_registers_participant(client, override_user):
-    # 测试：将已上传脚本挂载到 simulation 时，应把脚本的 simulation_id 更新，并将用户注册为参与者。
-    user = {"email": "player@example.com", "user_type": "individual"}
-    override_user(user)
-
-    asyncio.run(script_registry.clear())
-
-    async def _setup() -> ScriptMetadata:
-        await views._orchestrator.create_simulation("sim-attach")
-        return await script_registry.register_script(
-            simulation_id=None,
-            user_id=user["email"],
-            script_code=SCRIPT_SOURCE,
-            description=None,
-            agent_kind=AgentKind.HOUSEHOLD,
-            entity_id="1",
-        )
+_HOUSEHOLD_COUNT_BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_HOUSEHOLD_USER = SimpleNamespace(
+    email="household@example.com",
+    created_at=_HOUSEHOLD_COUNT_BASE_TIME,
+    user_type="individual",
+)
+_FIRM_USER = SimpleNamespace(
+    email="firm@example.com",
+    created_at=_HOUSEHOLD_COUNT_BASE_TIME,
+    user_type="firm",
+)
+_ADMIN_USER = SimpleNamespace(
+    email="admin@example.com",
+    created_at=_HOUSEHOLD_COUNT_BASE_TIME,
+    user_type="admin",
+)
+# 视图只遍历 list_users() 的结果，共享不可变 tuple 即可。
+_HOUSEHOLD_USERS = (_HOUSEHOLD_USER,)
+_HOUSEHOLD_SCRIPT_ONE = ScriptMetadata(
+    script_id="script-1",
+    simulation_id="sim-main",
+    user_id="household@example.com",
+    description=None,
+    created_at=_HOUSEHOLD_COUNT_BASE_TIME,
+    code_version="v1",
+    agent_kind=AgentKind.HOUSEHOLD,
+    entity_id="1",
+)
+_VISIBLE_SCRIPT = ScriptMetadata(
+    script_id="script-visible",
+    simulation_id="sim-main",
+    user_id="household@example.com",
+    description="demo script",
+    created_at=_HOUSEHOLD_COUNT_BASE_TIME,
+    code_version="v1",
+    agent_kind=AgentKind.HOUSEHOLD,
+    entity_id="1",
+)
+_HOUSEHOLD_SCRIPT_TWO = ScriptMetadata(
+    script_id="script-2",
+    simulation_id="sim-main",
+    user_id="household@example.com",
+    description=None,
+    created_at=_HOUSEHOLD_COUNT_BASE_TIME,
+    code_version="v2",
+    agent_kind=AgentKind.HOUSEHOLD,
+    entity_id="2",
+)
 
-    metadata = asyncio.run(_setup())
 
-    try:
-        response = client.post(
-            "/web/scripts/attach",
-            data={
-                "simulation_id": "sim-attach",
-                "script_id": metadata.script_id,
-            },
-            follow_redirects=False,
-        )
+@pytest.mark.parametrize(
+    ("users", "participants", "scripts", "expected_count"),
+    [
+        (
+            [_HOUSEHOLD_USER, _FIRM_USER, _ADMIN_USER],
+            ["household@example.com", "firm@example.com"],
+            [],
+            0,
+        ),
+        (
+            [_HOUSEHOLD_USER],
+            [],
+            [_HOUSEHOLD_SCRIPT_ONE, _HOUSEHOLD_SCRIPT_TWO],
+            1,
+        ),
+    ],
+    ids=["no-scripts", "with-scripts"],
+)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_admin_dashboard_household_counts(
+    users,
+    participants,
+    scripts,
+    expected_count,
+    override_orchestrator,
+    patch_script_registry,
+    aclient,
+    as_admin,
+):
+    # 测试：管理员仪表盘的世界管理页应显示挂载家户脚本数，且按挂载家户脚本的用户去重计数。
+    override_orchestrator(_DashboardOrchestrator(participants=participants))
 
-        assert response.status_code == 303
-        meta_after = asyncio.run(
-            script_registry.get_user_script(metadata.script_id, user["email"])
-        )
-        assert meta_after.simulation_id == "sim-attach"
-        participants = asyncio.run(views._orchestrator.list_participants("sim-attach"))
-        assert user["email"] in participants
-    finally:
-        pass
+    async def fake_list_users():
+        return users
 
-        async def _cleanup() -> None:
-            await script_registry.clear()
-            try:
-                await views._orchestrator.data_access.delete_simulation("sim-attach")
-            except Exception:
-                pass
+    async def fake_list_all_scripts():
+        return scripts
 
-        asyncio.run(_cleanup())
+    async def fake_list_scripts(simulation_id):
+        assert simulation_id == "sim-main"
+        return scripts
 
+    _patch_dashboard_sources(
+        patch_script_registry,
+        users=fake_list_users,
+        list_all_scripts=fake_list_all_scripts,
+        list_scripts=fake_list_scripts,
+    )
 
-def test_admin_dashboard_lists_all_scripts(
-    patch_orchestrator, patch_script_registry, client, override_user
-):
-    # 测试：管理员视图应列出所有脚本并能显示脚本标识，且不会显示“无脚本”占位文本。
-    admin_user = {"email": "admin@example.com", "user_type": "admin"}
-    override_user(admin_user)
+    response = await aclient.get("/web/dashboard?simulation_id=sim-main&tab=manage")
+    assert response.status_code == 200
+    body = response.text
+    assert "挂载家户脚本数" in body
+    match = _HOUSEHOLD_COUNT_RE.search(body)
+    assert match and match.group(1) == str(expected_count)
 
-    base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
-    script_meta = ScriptMetadata(
-        script_id="script-visible",
-        simulation_id="sim-main",
-        user_id="household@example.com",
-        description="demo script",
-        created_at=base_time,
-        code_version="v1",
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_attach_script_registers_participant(as_player, sim):
+    # 测试：将已上传脚本挂载到 simulation 时，应把脚本的 simulation_id 更新，并将用户注册为参与者。
+    user = as_player
+
+    metadata = await script_registry.register_script(
+        simulation_id=None,
+        user_id=user["email"],
+        script_code=SCRIPT_SOURCE,
+        description=None,
         agent_kind=AgentKind.HOUSEHOLD,
         entity_id="1",
     )
 
-    class DummyFeatures:
-        def model_dump(self, mode: str = "json"):
-            return {"household_shock_enabled": False}
-
-    class DummyWorldState:
-        def __init__(self, simulation_id: str) -> None:
-            self.simulation_id = simulation_id
-
-        def model_dump(self, mode: str = "json"):
-            return _build_world_state_dump(self.simulation_id)
-
-    class DummyOrchestrator:
-        async def list_simulations(self):
-            return ["sim-main"]
+    response = await _asgi_post(
+        "/web/scripts/attach",
+        {
+            "simulation_id": sim,
+            "script_id": metadata.script_id,
+        },
+    )
 
-        async def get_simulation_features(self, simulation_id):
-            assert simulation_id == "sim-main"
-            return DummyFeatures()
+    _assert_redirect(response)
+    meta_after = await script_registry.get_user_script(
+        metadata.script_id, user["email"]
+    )
+    assert meta_after.simulation_id == sim
+    participants = await views._orchestrator.list_participants(sim)
+    assert user["email"] in participants
 
-        async def list_participants(self, simulation_id):
-            assert simulation_id == "sim-main"
-            return []
 
-        async def get_state(self, simulation_id):
-            assert simulation_id == "sim-main"
-            return DummyWorldState(simulation_id)
+_VISIBLE_SCRIPT_MARKERS = _encode_markers("script-visible")
+(_NO_SCRIPTS_MARKER,) = _encode_markers("暂时没有上传脚本")
 
-        async def list_recent_script_failures(
-            self, simulation_id: str, limit: int = 50
-        ):
-            assert simulation_id == "sim-main"
-            return []
 
-    patch_orchestrator.setattr(views, "_orchestrator", DummyOrchestrator())
+@pytest.mark.asyncio(loop_scope="session")
+async def test_admin_dashboard_lists_all_scripts(
+    override_orchestrator,
+    patch_script_registry,
+    aclient,
+    as_admin,
+):
+    # 测试：管理员视图应列出所有脚本并能显示脚本标识，且不会显示“无脚本”占位文本。
+    override_orchestrator(_DashboardOrchestrator())
 
     async def fake_list_users():
-        return [
-            SimpleNamespace(
-                email="household@example.com",
-                created_at=base_time,
-                user_type="individual",
-            )
-        ]
+        return _HOUSEHOLD_USERS
 
     async def fake_list_all_scripts():
-        return [script_meta]
+        return [_VISIBLE_SCRIPT]
 
     async def fake_list_scripts(simulation_id):
         assert simulation_id == "sim-main"
-        return [script_meta]
+        return [_VISIBLE_SCRIPT]
 
-    patch_orchestrator.setattr(views.user_manager, "list_users", fake_list_users)
-    patch_script_registry.setattr(
-        script_registry, "list_all_scripts", fake_list_all_scripts
+    _patch_dashboard_sources(
+        patch_script_registry,
+        users=fake_list_users,
+        list_all_scripts=fake_list_all_scripts,
+        list_scripts=fake_list_scripts,
     )
-    patch_script_registry.setattr(script_registry, "list_scripts", fake_list_scripts)
 
-    try:
-        response = client.get("/web/dashboard?simulation_id=sim-main")
-        assert response.status_code == 200
-        assert "script-visible" in response.text
-        assert "暂时没有上传脚本" not in response.text
-    finally:
-        pass
+    response = await aclient.get("/web/dashboard?simulation_id=sim-main")
+    assert response.status_code == 200
+    body = response.content
+    _assert_contains_all(body, _VISIBLE_SCRIPT_MARKERS)
+    assert _NO_SCRIPTS_MARKER not in body
 
 
-def test_attach_script_respects_limit(client, override_user):
+@pytest.mark.asyncio(loop_scope="session")
+async def test_attach_script_respects_limit(as_player, sim):
     # 测试：当 simulation 对单用户脚本数有限制时，超出限制的挂载请求应被拒绝并保留脚本为未绑定。
-    user = {"email": "player@example.com", "user_type": "individual"}
-    override_user(user)
-
-    asyncio.run(script_registry.clear())
-
-    async def _setup() -> tuple[ScriptMetadata, ScriptMetadata]:
-        await views._orchestrator.create_simulation("sim-limit-attach")
-        await script_registry.set_simulation_limit("sim-limit-attach", 1)
-        first = await script_registry.register_script(
-            simulation_id=None,
-            user_id=user["email"],
-            script_code=SCRIPT_SOURCE,
-            description=None,
-            agent_kind=AgentKind.HOUSEHOLD,
-            entity_id="1",
-        )
-        second = await script_registry.register_script(
-            simulation_id=None,
-            user_id=user["email"],
-            script_code=SCRIPT_SOURCE,
-            description=None,
-            agent_kind=AgentKind.HOUSEHOLD,
-            entity_id="2",
-        )
-        return first, second
-
-    script_one, script_two = asyncio.run(_setup())
-
-    try:
-        # First attach should succeed
-        response_ok = client.post(
-            "/web/scripts/attach",
-            data={
-                "simulation_id": "sim-limit-attach",
-                "script_id": script_one.script_id,
-            },
-            follow_redirects=False,
-        )
-        assert response_ok.status_code == 303
-
-        # Second attach should hit limit
-        response_fail = client.post(
-            "/web/scripts/attach",
-            data={
-                "simulation_id": "sim-limit-attach",
-                "script_id": script_two.script_id,
-            },
-            follow_redirects=False,
-        )
-        assert response_fail.status_code == 303
-        location = response_fail.headers.get("location", "")
-        assert "error=" in location
-
-        meta_after_second = asyncio.run(
-            script_registry.get_user_script(script_two.script_id, user["email"])
+    user = as_player
+
+    await script_registry.set_simulation_limit(sim, 1)
+    script_one, script_two = await asyncio.gather(
+        *(
+            script_registry.register_script(
+                simulation_id=None,
+                user_id=user["email"],
+                script_code=SCRIPT_SOURCE,
+                description=None,
+                agent_kind=AgentKind.HOUSEHOLD,
+                entity_id=entity_id,
+            )
+            for entity_id in ("1", "2")
         )
-        assert meta_after_second.simulation_id is None
-    finally:
-        pass
+    )
 
-        async def _cleanup() -> None:
-            await script_registry.clear()
-            try:
-                await views._orchestrator.data_access.delete_simulation(
-                    "sim-limit-attach"
-                )
-            except Exception:
-                pass
+    # First attach should succeed
+    response_ok = await _asgi_post(
+        "/web/scripts/attach",
+        {
+            "simulation_id": sim,
+            "script_id": script_one.script_id,
+        },
+    )
+    _assert_redirect(response_ok)
+
+    # Second attach should hit limit
+    response_fail = await _asgi_post(
+        "/web/scripts/attach",
+        {
+            "simulation_id": sim,
+            "script_id": script_two.script_id,
+        },
+    )
+    _assert_redirect(response_fail, contains=("error=",))
 
-        asyncio.run(_cleanup())
+    meta_after_second = await script_registry.get_user_script(
+        script_two.script_id, user["email"]
+    )
+    assert meta_after_second.simulation_id is None
 
 
-def test_download_logs_forbidden(patch_orchestrator, client, override_user):
+@pytest.mark.asyncio(loop_scope="session")
+async def test_download_logs_forbidden(override_orchestrator, aclient, as_player):
     # 测试：非参与者访问下载日志接口应返回 403 并且不触发日志检索调用。
-    user = {"email": "player@example.com", "user_type": "individual"}
-    override_user(user)
-
-    class DummyOrchestrator:
-        async def list_participants(self, simulation_id):
-            return ["other@example.com"]
-
-        async def get_recent_logs(self, simulation_id, limit=None):
-            pytest.fail("should not fetch logs when user is not a participant")
-
-    patch_orchestrator.setattr(views, "_orchestrator", DummyOrchestrator())
+    override_orchestrator(_LogsOrchestrator(["other@example.com"]))
 
-    try:
-        response = client.get("/web/logs/sim-1/download")
-        assert response.status_code == 403
-    finally:
-        pass
+    response = await aclient.get("/web/logs/sim-1/download")
+    assert response.status_code == 403
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Iterable, Sequence
 
 from econ_sim.core.orchestrator import SimulationOrchestrator
@@ -38,39 +39,50 @@ async def seed_required_scripts(
     if orchestrator is not None:
         await orchestrator.create_simulation(simulation_id)
 
+    specs = []
     for kind in REQUIRED_AGENT_KINDS:
         if kind in skip_set:
             continue
 
         if kind is AgentKind.HOUSEHOLD:
             for household_id in household_ids:
-                metadata = await registry.register_script(
-                    simulation_id=simulation_id,
-                    user_id=f"seed-{kind.value}-{household_id}",
-                    script_code=BASELINE_STUB_SCRIPT,
-                    description=f"seed for {kind.value} {household_id}",
-                    agent_kind=kind,
-                    entity_id=str(household_id),
+                specs.append(
+                    {
+                        "user_id": f"seed-{kind.value}-{household_id}",
+                        "description": f"seed for {kind.value} {household_id}",
+                        "agent_kind": kind,
+                        "entity_id": str(household_id),
+                    }
                 )
-                if orchestrator is not None:
-                    await orchestrator.data_access.ensure_entity_state(
-                        simulation_id,
-                        metadata.agent_kind,
-                        metadata.entity_id,
-                    )
         else:
-            entity_id = f"{kind.value}_seed"
-            metadata = await registry.register_script(
+            specs.append(
+                {
+                    "user_id": f"seed-{kind.value}",
+                    "description": f"seed for {kind.value}",
+                    "agent_kind": kind,
+                    "entity_id": f"{kind.value}_seed",
+                }
+            )
+
+    # Registrations are independent (distinct users and entities), so issue
+    # them together; the registry serialises index updates under its lock.
+    metadatas = await asyncio.gather(
+        *(
+            registry.register_script(
                 simulation_id=simulation_id,
-                user_id=f"seed-{kind.value}",
                 script_code=BASELINE_STUB_SCRIPT,
-                description=f"seed for {kind.value}",
-                agent_kind=kind,
-                entity_id=entity_id,
+                **spec,
+            )
+            for spec in specs
+        )
+    )
+
+    if orchestrator is not None:
+        # ensure_entity_state is a read-modify-write of the whole world state
+        # (and the bank seeds from existing households), so keep it ordered.
+        for metadata in metadatas:
+            await orchestrator.data_access.ensure_entity_state(
+                simulation_id,
+                metadata.agent_kind,
+                metadata.entity_id,
             )
-            if orchestrator is not None:
-                await orchestrator.data_access.ensure_entity_state(
-                    simulation_id,
-                    metadata.agent_kind,
-                    metadata.entity_id,
-                )
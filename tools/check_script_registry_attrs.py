@@ -9,12 +9,24 @@ import inspect
 from econ_sim.script_engine import script_registry, get_script_registry
 
 print("script_registry (proxy):", type(script_registry))
-print("has attr 'list_scripts' on proxy?", hasattr(script_registry, "list_scripts"))
+# Inspect the proxy through its class/instance dicts only: hasattr()/dir() would
+# go through the proxy's __getattr__ and resolve (possibly connect) the real registry.
+proxy_cls = type(script_registry)
 print(
-    "dir(script_registry) sample:",
-    [a for a in dir(script_registry) if a.startswith("list") or a.endswith("scripts")][
-        :30
-    ],
+    "'list_scripts' defined on proxy class?",
+    any("list_scripts" in klass.__dict__ for klass in proxy_cls.__mro__),
+)
+print(
+    "'__getattr__' forwarding on proxy class?",
+    "__getattr__" in proxy_cls.__dict__,
+)
+print(
+    "proxy attribute names sample:",
+    [
+        a
+        for a in list(vars(script_registry).keys()) + list(proxy_cls.__dict__.keys())
+        if a.startswith("list") or a.endswith("scripts")
+    ][:30],
 )
 
 real = get_script_registry()
@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
-"""Utility: list scripts attached to a simulation and show their metadata.
+"""Utility: list scripts attached to simulations and show their metadata.
 
-Usage: python tools/list_attached_scripts.py <simulation_id>
+Usage: python tools/list_attached_scripts.py <simulation_id> [<simulation_id> ...]
+
+All simulations are fetched in one registry call (a single store query for
+simulations not yet loaded).
 
 This imports the project package and calls the ScriptRegistry to list scripts.
 It requires the environment to be set up (e.g., ECON_SIM_POSTGRES_DSN if using Postgres
@@ -9,30 +12,47 @@ backing store). Run inside the project virtualenv.
 """
 import sys
 import asyncio
-from pprint import pprint
+from typing import List
 
 from econ_sim.script_engine import get_script_registry
 
 
-async def main(sim_id: str):
-    reg = get_script_registry()
-    metas = await reg.list_scripts(sim_id)
+def _print_scripts(sim_id: str, metas) -> None:
     if not metas:
         print(f"No scripts attached to simulation {sim_id}")
         return
+    lines = []
     for m in metas:
-        print("---")
-        print(f"script_id: {m.script_id}")
-        print(f"user_id: {m.user_id}")
-        print(f"agent_kind: {m.agent_kind}")
-        print(f"entity_id: {m.entity_id}")
-        print(f"created_at: {m.created_at}")
-        print(f"description: {m.description}")
+        lines.extend(
+            (
+                "---",
+                f"script_id: {m.script_id}",
+                f"user_id: {m.user_id}",
+                f"agent_kind: {m.agent_kind}",
+                f"entity_id: {m.entity_id}",
+                f"created_at: {m.created_at}",
+                f"description: {m.description}",
+            )
+        )
+    lines.append("")
+    sys.stdout.write("\n".join(lines))
+
+
+async def main(sim_ids: List[str]):
+    reg = get_script_registry()
+    metas_by_sim = await reg.list_scripts_for_simulations(sim_ids)
+    for idx, (sim_id, metas) in enumerate(metas_by_sim.items()):
+        if len(metas_by_sim) > 1:
+            if idx:
+                print()
+            print(f"=== {sim_id} ===")
+        _print_scripts(sim_id, metas)
 
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python tools/list_attached_scripts.py <simulation_id>")
+        print(
+            "Usage: python tools/list_attached_scripts.py <simulation_id> [<simulation_id> ...]"
+        )
         sys.exit(1)
-    sim = sys.argv[1]
-    asyncio.run(main(sim))
+    asyncio.run(main(sys.argv[1:]))
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Run independent sample-world rollouts in parallel worker processes.
+
+Each trajectory builds its own world inside a worker, advances it ``ticks``
+times with ``run_tick_new`` and sends back only a small per-tick summary, so
+the (large) world state never crosses the process boundary.
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+from econ_sim.core.entity_factory import create_sample_world
+from econ_sim.core.orchestrator import next_tick_and_day, run_tick_new
+from econ_sim.utils.settings import get_world_config
+
+
+def rollout(num_households: int, ticks: int) -> List[Dict[str, Any]]:
+    config = get_world_config()
+    world = create_sample_world(config, num_households)
+    summaries: List[Dict[str, Any]] = []
+    for _ in range(ticks):
+        updates, _logs, ledgers, market_signals = run_tick_new(world)
+        firm = world.firm
+        summaries.append(
+            {
+                "tick": world.tick,
+                "day": world.day,
+                "updates": len(updates),
+                "ledgers": len(ledgers),
+                "firm_cash": float(firm.balance_sheet.cash),
+                "firm_inventory": float(firm.balance_sheet.inventory_goods),
+                "firm_price": float(firm.price),
+                "market_signals": dict(market_signals or {}),
+            }
+        )
+        world.tick, world.day = next_tick_and_day(
+            config.simulation, world.tick, world.day
+        )
+    return summaries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trajectories", type=int, default=4)
+    parser.add_argument("--ticks", type=int, default=3)
+    parser.add_argument("--households", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [
+            pool.submit(rollout, args.households, args.ticks)
+            for _ in range(args.trajectories)
+        ]
+        for idx, future in enumerate(futures):
+            summaries = future.result()
+            print(f"trajectory {idx}: {len(summaries)} ticks")
+            for summary in summaries:
+                print("  ", summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,62 @@
 #!/usr/bin/env python3
-from econ_sim.core.entity_factory import (
-    create_household_state,
-    create_firm_state,
-    create_bank_state,
-    create_government_state,
-    create_central_bank_state,
-    create_macro_state,
-)
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from econ_sim.core.entity_factory import create_sample_world
 from econ_sim.utils.settings import get_world_config
 from econ_sim.data_access.models import WorldState
 from econ_sim.core.orchestrator import run_tick_new
 from econ_sim.logic_modules import baseline_stub
 
+_QUIET = os.environ.get("ECON_SIM_QUIET", "").lower() in {"1", "true", "yes", "on"}
+
 
 def build_sample_world(num_households: int = 6) -> WorldState:
-    cfg = get_world_config()
-    households = {}
-    for hid in range(num_households):
-        households[hid] = create_household_state(cfg, hid)
-
-    firm = create_firm_state(cfg, "firm_1")
-    bank = create_bank_state(cfg, "bank", households)
-    gov = create_government_state(cfg, "government")
-    cb = create_central_bank_state(cfg, "central_bank")
-    macro = create_macro_state()
-
-    return WorldState(
-        simulation_id="debug",
-        tick=1,
-        day=1,
-        households=households,
-        firm=firm,
-        bank=bank,
-        government=gov,
-        central_bank=cb,
-        macro=macro,
+    return create_sample_world(get_world_config(), num_households)
+
+
+def _write_logs_jsonl(logs) -> None:
+    """Write tick logs to stdout as JSON lines in a single write."""
+    sys.stdout.write(
+        "".join(
+            json.dumps({"m": l.message, "c": l.context}, default=str) + "\n"
+            for l in logs
+        )
     )
 
 
-if __name__ == "__main__":
-    w = build_sample_world(6)
-    decisions = baseline_stub.generate_baseline_decisions(w)
-    print("Baseline decisions sample (household consumption budgets):")
-    for hid, d in decisions.households.items():
-        print(hid, getattr(d, "consumption_budget", None))
+def _dump_results(
+    w: WorldState, decisions, updates, logs, *, verbose: bool = False
+) -> None:
+    """Print the baseline decisions and tick outcome (skipped under ECON_SIM_QUIET).
+
+    Household budgets are summarised; per-household rows only with ``verbose``.
+    """
+    if _QUIET:
+        return
+    raw_budgets = [
+        getattr(d, "consumption_budget", None) for d in decisions.households.values()
+    ]
+    present = [b for b in raw_budgets if b is not None]
+    budgets = np.fromiter(present, dtype=np.float64, count=len(present))
+    print(
+        f"Baseline consumption budgets: {budgets.size}/{len(raw_budgets)} "
+        "decisions set a budget"
+    )
+    if budgets.size:
+        print(
+            f"  mean={budgets.mean():.4f} std={budgets.std():.4f} "
+            f"min={budgets.min():.4f} max={budgets.max():.4f}"
+        )
+    if verbose:
+        print("Baseline decisions sample (household consumption budgets):")
+        for hid, d in decisions.households.items():
+            print(hid, getattr(d, "consumption_budget", None))
 
-    updates, logs, ledgers, signals = run_tick_new(w)
     print("\nLOGS:")
     for l in logs:
         print(l.message, l.context)
@@ -64,4 +75,25 @@ if __name__ == "__main__":
     for hid, hh in w.households.items():
         print(hid, hh.last_consumption)
 
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run one tick on a sample world.")
+    parser.add_argument("--households", type=int, default=6)
+    parser.add_argument(
+        "--verbose", action="store_true", help="print per-household budgets"
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="only write the tick logs to stdout as JSON lines",
+    )
+    args = parser.parse_args()
+
+    w = build_sample_world(args.households)
+    decisions = baseline_stub.generate_baseline_decisions(w)
+    updates, logs, ledgers, signals = run_tick_new(w)
+    if args.jsonl:
+        _write_logs_jsonl(logs)
+        sys.exit(0)
+    _dump_results(w, decisions, updates, logs, verbose=args.verbose)
     print("\nDone")
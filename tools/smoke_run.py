@@ -1,5 +1,11 @@
 # Minimal smoke test for run_tick_new
+#
+# Usage:
+#   python tools/smoke_run.py              # one household, print counts
+#   python tools/smoke_run.py --sweep 64   # worlds with 1..64 households, in parallel
+import argparse
 import json
+import multiprocessing as mp
 import sys
 
 try:
@@ -18,35 +24,69 @@ except Exception as e:
     print("IMPORT_ERROR", e)
     raise
 
-# construct minimal world
-hh = HouseholdState(id=1, balance_sheet=BalanceSheet(cash=100.0))
-firm = FirmState()
-bank = BankState()
-gov = GovernmentState()
-cb = CentralBankState()
-macro = MacroState()
-world = WorldState(
-    simulation_id="smoke",
-    tick=1,
-    day=1,
-    households={1: hh},
-    firm=firm,
-    bank=bank,
-    government=gov,
-    central_bank=cb,
-    macro=macro,
-)
 
-try:
-    updates, logs, ledgers, market_signals = run_tick_new(world)
-    print("OK")
-    print("updates:", len(updates))
-    print("logs:", len(logs))
-    print("ledgers:", len(ledgers))
-    print("market_signals:", json.dumps(market_signals))
-except Exception as e:
-    print("RUNTIME_ERROR", e)
-    import traceback
+def build_world(num_households: int = 1) -> WorldState:
+    # construct minimal world
+    households = {
+        hid: HouseholdState(id=hid, balance_sheet=BalanceSheet(cash=100.0))
+        for hid in range(1, num_households + 1)
+    }
+    return WorldState(
+        simulation_id="smoke",
+        tick=1,
+        day=1,
+        households=households,
+        firm=FirmState(),
+        bank=BankState(),
+        government=GovernmentState(),
+        central_bank=CentralBankState(),
+        macro=MacroState(),
+    )
+
+
+def run_smoke(num_households: int) -> dict:
+    updates, logs, ledgers, market_signals = run_tick_new(build_world(num_households))
+    return {
+        "households": num_households,
+        "updates": len(updates),
+        "logs": len(logs),
+        "ledgers": len(ledgers),
+        "market_signals": market_signals,
+    }
+
+
+def _sweep(max_households: int) -> None:
+    # spawn keeps workers from inheriting the parent's imported state
+    ctx = mp.get_context("spawn")
+    with ctx.Pool() as pool:
+        for result in pool.imap_unordered(run_smoke, range(1, max_households + 1)):
+            sys.stdout.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Smoke test run_tick_new.")
+    parser.add_argument(
+        "--sweep",
+        type=int,
+        default=None,
+        metavar="N",
+        help="run worlds with 1..N households in parallel and print JSON lines",
+    )
+    args = parser.parse_args()
+
+    try:
+        if args.sweep:
+            _sweep(args.sweep)
+            sys.exit(0)
+        result = run_smoke(1)
+        print("OK")
+        print("updates:", result["updates"])
+        print("logs:", result["logs"])
+        print("ledgers:", result["ledgers"])
+        print("market_signals:", json.dumps(result["market_signals"]))
+    except Exception as e:
+        print("RUNTIME_ERROR", e)
+        import traceback
 
-    traceback.print_exc()
-    sys.exit(2)
+        traceback.print_exc()
+        sys.exit(2)